@@ -4,7 +4,7 @@ AR_ImportGaea
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportGaea
-Version: 1.0.0
+Version: 1.1.1
 Description-US: Creates terrain setup from Gaea heightfield map. Requires Redshift!
 
 Note: It is recommended that you export with following settings
@@ -20,24 +20,77 @@ Written for Maxon Cinema 4D 2023.2.1
 Python version 3.10.8
 
 Change log:
+1.1.1 (19.10.2026) - Heightmap statistics are shown in the status bar
+                     Only Redshift's maximum displacement is derived from the heightmap range, displacement scale stays at the terrain height
+1.1.0 (19.10.2026) - Heightmap is analyzed (min, max, height range) and the editor terrain is a block mean downsampled proxy mesh instead of a displaced plane
+                     Redshift's maximum displacement is set from the heightmap's maximum value
 1.0.0 (10.01.2023) - Initial realease
 """
 
 # Libraries
 import c4d
 import redshift
+from array import array
 from c4d import storage as s
 from c4d import gui as g
 
 # Functions
+def ReadHeightfield(fn, resolution):
+    bmp = c4d.bitmaps.BaseBitmap() # Initialize bitmap
+    if bmp.InitWith(fn)[0] != c4d.IMAGERESULT_OK: # Load heightmap
+        return None
+    width, height = bmp.GetSize()
+    res = max(2, min(resolution, width, height)) # Proxy resolution
+    columns = [int(j * width / res) for j in range(res + 1)] # Column block bounds
+    sums = [[0.0] * res for i in range(res)] # Block sums
+    rows = [0] * res # Rows in every block
+    low = float('inf')
+    high = float('-inf')
+    buffer = c4d.storage.ByteSeq(None, width * 4) # One row of 32-bit floats
+    for y in range(height): # Read row by row, full image is never converted at once
+        bmp.GetPixelCnt(0, y, width, buffer, 4, c4d.COLORMODE_GRAYf, c4d.PIXELCNT_0)
+        row = array('f', bytes(buffer))
+        low = min(low, min(row))
+        high = max(high, max(row))
+        b = min(y * res // height, res - 1) # Block row
+        rows[b] += 1
+        blockSums = sums[b]
+        for j in range(res): # Block mean downsampling
+            blockSums[j] += sum(row[columns[j]:columns[j+1]])
+    bmp.FlushAll() # Free the bitmap
+    grid = [[sums[i][j] / (rows[i] * (columns[j+1] - columns[j])) for j in range(res)] for i in range(res)]
+    return {'width': width, 'height': height, 'min': low, 'max': high, 'res': res, 'grid': grid}
+
+def CreateProxyMesh(field, size, height):
+    res = field['res']
+    grid = field['grid']
+    step = size / float(res - 1)
+    op = c4d.PolygonObject(res * res, (res - 1) * (res - 1)) # Initialize polygon object
+    op.SetAllPoints([c4d.Vector(-size * 0.5 + j * step, grid[i][j] * height, size * 0.5 - i * step)
+                     for i in range(res) for j in range(res)]) # Image's top row is the far edge
+    k = 0
+    for i in range(res - 1): # Grid polygons
+        for j in range(res - 1):
+            a = i * res + j
+            op.SetPolygon(k, c4d.CPolygon(a, a + 1, a + res + 1, a + res))
+            k += 1
+    op.Message(c4d.MSG_UPDATE)
+    return op
+
 def CreateGaeaTerrainSetup(fn):
 
     size       = 5000 # Gaea's standard width is 5 km
     height     = 2600 # Gaea's standard height is 2.6 km
     resolution = 512 # Segment count
+    field      = ReadHeightfield(fn, resolution) # Heightmap statistics and proxy data
+    if field is not None:
+        c4d.StatusSetText("%sx%s, min %.4f, max %.4f, height range %.1f m" % (field['width'], field['height'], field['min'], field['max'], (field['max'] - field['min']) * height))
     # -------------------------------------------------------------------------------
     terrainNull   = c4d.BaseObject(c4d.Onull) # Initialize null object 
-    terrainEditor = c4d.BaseObject(c4d.Oplane) # Initialize object for editor use
+    if field is not None: # Decimated proxy mesh from the heightmap, no displacer needed
+        terrainEditor = CreateProxyMesh(field, size, height) # Initialize object for editor use
+    else:
+        terrainEditor = c4d.BaseObject(c4d.Oplane) # Initialize object for editor use
     terrainRender = c4d.BaseObject(c4d.Oplane) # Initialize object for render use
 
     # Null Settings
@@ -51,30 +104,35 @@ def CreateGaeaTerrainSetup(fn):
     terrainRender.InsertTag(protectionTagB) # Insert protection tag to terrain object
     # -------------------------------------------------------------------------------
     # Editor Terrain Setup
-    terrainEditor.SetName("Terrain Editor")
-    terrainEditor[c4d.PRIM_PLANE_WIDTH] = size
-    terrainEditor[c4d.PRIM_PLANE_HEIGHT] = size
-    terrainEditor[c4d.PRIM_PLANE_SUBW] = resolution
-    terrainEditor[c4d.PRIM_PLANE_SUBH] = resolution
-    terrainEditor[c4d.PRIM_AXIS] = 2 # 0;+X, 1;-X, 2;+Y, 3;-Y, 4;+Z, 5;-Z
-    terrainEditor[c4d.ID_BASEOBJECT_VISIBILITY_EDITOR] = 2 # 2;Default, 0;On, 1;Off
-    terrainEditor[c4d.ID_BASEOBJECT_VISIBILITY_RENDER] = 1
-
-    # Bitmap shader
-    shader = c4d.BaseShader(c4d.Xbitmap) # Initialize bitmap shader
-    shader[c4d.BITMAPSHADER_FILENAME] = fn # Set bitmap file
-    shader[c4d.BITMAPSHADER_COLORPROFILE] = 2 # Set shader's color profile to 'sRGB'
-    #shader[c4d.BITMAPSHADER_COLORPROFILE] = 1 # Set shader's color profile to 'Linear'
-
-    # Displacer
-    displacer = c4d.BaseObject(c4d.Odisplacer) # Initialize displacer deformer
-    displacer[c4d.MGDISPLACER_DISPLACEMENT_HEIGHT] = height # Set displaced height
-    displacer[c4d.MGDISPLACER_DISPLACEMENTMODE] = 0 # # Set displacement type to 'Intensity'
-    displacer[c4d.ID_MG_SHADER_SHADER] = shader # Set displacer shader
-    displacer[c4d.ID_MG_SHADER_TEXTAG_TILE] = False # Disable tiling to prevent jaggy edges
-    displacer.InsertUnder(terrainEditor) # Insert displacer deformer under terrain editor object
-    displacer.InsertShader(shader) # Insert shader to displacer
-    #displacer.Message(c4d.MSG_UPDATE) # Update
+    if field is not None: # Proxy mesh
+        terrainEditor.SetName("Terrain Editor")
+        terrainEditor[c4d.ID_BASEOBJECT_VISIBILITY_EDITOR] = 2 # 2;Default, 0;On, 1;Off
+        terrainEditor[c4d.ID_BASEOBJECT_VISIBILITY_RENDER] = 1
+    else: # Displaced plane
+        terrainEditor.SetName("Terrain Editor")
+        terrainEditor[c4d.PRIM_PLANE_WIDTH] = size
+        terrainEditor[c4d.PRIM_PLANE_HEIGHT] = size
+        terrainEditor[c4d.PRIM_PLANE_SUBW] = resolution
+        terrainEditor[c4d.PRIM_PLANE_SUBH] = resolution
+        terrainEditor[c4d.PRIM_AXIS] = 2 # 0;+X, 1;-X, 2;+Y, 3;-Y, 4;+Z, 5;-Z
+        terrainEditor[c4d.ID_BASEOBJECT_VISIBILITY_EDITOR] = 2 # 2;Default, 0;On, 1;Off
+        terrainEditor[c4d.ID_BASEOBJECT_VISIBILITY_RENDER] = 1
+
+        # Bitmap shader
+        shader = c4d.BaseShader(c4d.Xbitmap) # Initialize bitmap shader
+        shader[c4d.BITMAPSHADER_FILENAME] = fn # Set bitmap file
+        shader[c4d.BITMAPSHADER_COLORPROFILE] = 2 # Set shader's color profile to 'sRGB'
+        #shader[c4d.BITMAPSHADER_COLORPROFILE] = 1 # Set shader's color profile to 'Linear'
+
+        # Displacer
+        displacer = c4d.BaseObject(c4d.Odisplacer) # Initialize displacer deformer
+        displacer[c4d.MGDISPLACER_DISPLACEMENT_HEIGHT] = height # Set displaced height
+        displacer[c4d.MGDISPLACER_DISPLACEMENTMODE] = 0 # # Set displacement type to 'Intensity'
+        displacer[c4d.ID_MG_SHADER_SHADER] = shader # Set displacer shader
+        displacer[c4d.ID_MG_SHADER_TEXTAG_TILE] = False # Disable tiling to prevent jaggy edges
+        displacer.InsertUnder(terrainEditor) # Insert displacer deformer under terrain editor object
+        displacer.InsertShader(shader) # Insert shader to displacer
+        #displacer.Message(c4d.MSG_UPDATE) # Update
     # -------------------------------------------------------------------------------
     # Render Terrain Setup
     terrainRender.SetName("Terrain Render")
@@ -98,8 +156,8 @@ def CreateGaeaTerrainSetup(fn):
 
     # RS Object Tag Displacement Options
     rsObjectTag[c4d.REDSHIFT_OBJECT_GEOMETRY_DISPLACEMENTENABLED] = True
-    rsObjectTag[c4d.REDSHIFT_OBJECT_GEOMETRY_MAXDISPLACEMENT] = height
-    rsObjectTag[c4d.REDSHIFT_OBJECT_GEOMETRY_DISPLACEMENTSCALE] = height
+    rsObjectTag[c4d.REDSHIFT_OBJECT_GEOMETRY_MAXDISPLACEMENT] = height if field is None else height * max(abs(field['min']), abs(field['max']), 0.001) # Tight bound from the heightmap
+    rsObjectTag[c4d.REDSHIFT_OBJECT_GEOMETRY_DISPLACEMENTSCALE] = height # Raw values are relative to the terrain height
     rsObjectTag[c4d.REDSHIFT_OBJECT_GEOMETRY_AUTOBUMPENABLED] = True
 
     terrainRender.InsertTag(rsObjectTag) # Insert RS Object tag to terrain object
@@ -4,24 +4,205 @@ AR_ImportImageFolder
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportImageFolder
-Version: 1.0.1
-Description-US: Import image folder to materials. Shift: Generates also image planes.
+Version: 1.2.1
+Description-US: Import image folder to materials. Shift: Generates also image planes. Ctrl: Includes sub folders.
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.2.1 (19.10.2026) - Unreadable folders and files are skipped, cancelling the folder dialog doesn't leave an open undo
+1.2.0 (19.10.2026) - File info (size, dimensions, alpha) is read in parallel threads, materials and planes are built after that
+                     Image shader is created once and cloned to luminance and alpha channels, alpha channel is enabled for images with alpha
+                     Ctrl: Includes sub folders
+1.1.0 (19.10.2026) - Image size is read from the file header, bitmap is loaded only if the header is unreadable
 1.0.1 (14.03.2021) - Updated for R25
 """
 
 # Libraries
 import c4d, os
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from c4d import storage as s
 
+# Variables
+FORMATS = {"tif", "tiff", "psd", "jpg", "jpeg", "png", "exr", "tga"} # Supported file formats
+
 # Functions
+def ReadCString(f):
+    chars = b'' # Initialize bytes for null terminated string
+    while True:
+        c = f.read(1)
+        if c in (b'', b'\x00'):
+            return chars
+        chars += c
+
+def ParseImageHeader(f):
+    head = f.read(32) # Signatures and fixed headers fit here
+    if head[:8] == b'\x89PNG\r\n\x1a\n': # PNG, IHDR chunk is always first
+        width, height = struct.unpack('>II', head[16:24])
+        return width, height, head[25] in (4, 6) # Gray + alpha, RGBA
+    if head[:4] == b'8BPS': # PSD
+        channels, height, width = struct.unpack('>HII', head[12:22])
+        return width, height, channels > 3
+    if head[:4] == b'\x76\x2f\x31\x01': # EXR, read header attributes
+        f.seek(8)
+        size = None
+        alpha = False
+        while True:
+            name = ReadCString(f)
+            if name == b'': # End of header
+                break
+            ReadCString(f) # Attribute type
+            length = struct.unpack('<i', f.read(4))[0]
+            if name == b'dataWindow':
+                xMin, yMin, xMax, yMax = struct.unpack('<iiii', f.read(16))
+                size = (xMax - xMin + 1, yMax - yMin + 1)
+            elif name == b'channels':
+                data = f.read(length) # Channel list
+                pos = 0
+                while pos < len(data) and data[pos] != 0: # Name, null, 16 bytes of channel info
+                    end = data.index(b'\x00', pos)
+                    if data[pos:end] == b'A' or data[pos:end].endswith(b'.A'): # Alpha channel
+                        alpha = True
+                    pos = end + 17
+            else:
+                f.seek(length, 1) # Skip attribute value
+        if size is None:
+            return None
+        return size[0], size[1], alpha
+    if head[:2] == b'\xff\xd8': # JPEG, jump from segment to segment until SOF marker
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) != 2 or marker[0] != 0xFF:
+                return None
+            while marker[1] == 0xFF: # Fill bytes
+                marker = marker[1:] + f.read(1)
+            code = marker[1]
+            if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7: # Markers without length
+                continue
+            length = struct.unpack('>H', f.read(2))[0]
+            if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC): # Start of frame
+                height, width = struct.unpack('>xHH', f.read(5))
+                return width, height, False
+            f.seek(length - 2, 1) # Skip segment
+    if head[:4] in (b'II*\x00', b'MM\x00*'): # TIFF, read the first IFD
+        endian = '<' if head[:2] == b'II' else '>'
+        f.seek(struct.unpack(endian + 'I', head[4:8])[0])
+        count = struct.unpack(endian + 'H', f.read(2))[0]
+        entries = f.read(count * 12)
+        size = {}
+        alpha = False
+        for i in range(count):
+            tag, valueType = struct.unpack(endian + 'HH', entries[i*12:i*12+4])
+            if tag in (256, 257): # Image width, image length
+                fmt = 'H' if valueType == 3 else 'I'
+                size[tag] = struct.unpack(endian + fmt, entries[i*12+8:i*12+8+struct.calcsize(fmt)])[0]
+            elif tag == 338: # Extra samples, alpha
+                alpha = True
+        if 256 in size and 257 in size:
+            return size[256], size[257], alpha
+        return None
+    if len(head) >= 18 and head[2] in (1, 2, 3, 9, 10, 11): # TGA, no signature, check image type
+        width, height = struct.unpack('<HH', head[12:16])
+        if width > 0 and height > 0:
+            return width, height, (head[17] & 0x0F) > 0 # Alpha bits
+    return None
+
+def ReadImageInfo(path):
+    try:
+        with open(path, 'rb') as f: # Read only the header, not the pixels
+            return ParseImageHeader(f)
+    except (OSError, struct.error, IndexError, ValueError):
+        return None
+
+def GetImageSize(path, shader):
+    irs = c4d.modules.render.InitRenderStruct() # Needed to get shader's bitmap info
+    if shader.InitRender(irs) == c4d.INITRENDERRESULT_OK: # Fallback, loads the whole bitmap
+        bitmap = shader.GetBitmap() # Get bitmap
+        shader.FreeRender() # Frees all resources used by this shader
+        if bitmap is not None: # If there is bitmap
+            return bitmap.GetSize() # Get bitmap width and height in pixels
+    return None
+
+def ScanImages(folder, recursive):
+    paths = [] # Initialize a list for image paths
+    stack = [folder] # Folders to scan
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False): # Sub folder
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.name.rpartition(".")[-1].lower() in FORMATS: # If file is supported
+                        paths.append(entry.path)
+        except OSError: # No permission or broken link, skip the folder
+            pass
+    return sorted(paths)
+
+def ProbeImage(path):
+    info = ReadImageInfo(path) # Header only, safe to run in a worker thread
+    try:
+        size = os.path.getsize(path)
+    except OSError: # Broken link or no permission
+        size = 0
+    return {'path': path,
+            'bytes': size,
+            'size': info[:2] if info else None,
+            'alpha': info[2] if info else False}
+
+def ProbeImages(paths):
+    workers = min(16, (os.cpu_count() or 4) * 2) # File reading, not computing
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(ProbeImage, paths)) # Keeps the order of the paths
+
+def BitmapShader(path):
+    shader = c4d.BaseShader(c4d.Xbitmap)
+    shader[c4d.BITMAPSHADER_FILENAME] = path
+    return shader
+
+def CreateMaterial(image):
+    mat = c4d.BaseMaterial(c4d.Mmaterial)
+    mat[c4d.MATERIAL_USE_REFLECTION] = 0 # Disable reflection channel
+    mat[c4d.MATERIAL_USE_ALPHA] = image['alpha'] # Enable alpha channel if image has alpha
+
+    color = BitmapShader(image['path']) # Create shader once
+    luminance = color.GetClone() # Same shader for luminance channel
+    alpha = color.GetClone() # Same shader for alpha channel
+    mat[c4d.MATERIAL_COLOR_SHADER] = color
+    mat[c4d.MATERIAL_LUMINANCE_SHADER] = luminance
+    mat[c4d.MATERIAL_ALPHA_SHADER] = alpha
+    mat.InsertShader(color) # Insert shader to color channel
+    mat.InsertShader(luminance) # Insert shader to luminance channel
+    mat.InsertShader(alpha) # Insert shader to alpha channel
+
+    mat.Message(c4d.MSG_UPDATE)
+    mat.Update(True, True) # Update material
+    mat.SetName(os.path.basename(image['path']).rpartition(".")[0]) # Get material name from file path
+    if image['size'] is None: # Header was unreadable
+        image['size'] = GetImageSize(image['path'], color)
+    return mat
+
+def CreatePlane(mat, size):
+    plane = c4d.BaseObject(c4d.Oplane) # Initialize plane object
+    plane.SetName(mat.GetName()) # Set plane's name same as the material name
+    plane[c4d.PRIM_AXIS] = 5 # Set plane's orientation to -z
+    plane[c4d.PRIM_PLANE_SUBW] = 1 # Set plane's width segments
+    plane[c4d.PRIM_PLANE_SUBH] = 1 # Set plane's height segments
+    if size is not None:
+        plane[c4d.PRIM_PLANE_WIDTH] = size[0] # Set plane's width
+        plane[c4d.PRIM_PLANE_HEIGHT] = size[1] # Set planes height
+
+    tag = c4d.BaseTag(5616) # Initialize texture tag
+    tag[c4d.TEXTURETAG_MATERIAL] = mat # Set material to texture tag
+    tag[c4d.TEXTURETAG_PROJECTION] = 6 # Set texture projection to uvw mapping
+    plane.InsertTag(tag) # Insert texture tag to object
+    return plane
+
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
-    doc.StartUndo() # Start recording undos
     folder = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select image folder',c4d.FILESELECT_DIRECTORY,'')
     if not folder: return # If no folder, quit the script
 
@@ -49,75 +230,24 @@ def main():
         else: # No keyboard modifiers used
             keyMod = 'None'
 
-    try: # Try to execute following script
-        files = os.listdir(folder)
-        for f in files: # Loop through files
-            extension = f.rpartition(".")[-1].lower()
-            formats = ["tif", "tiff", "psd", "jpg", "jpeg", "png", "exr", "tga"] # Supported file formats
-            if extension in formats: # If file is supported
-                mat = c4d.BaseMaterial(c4d.Mmaterial)
-                path = os.path.join(folder, f) #path = folder+"\\"+f
-                mat[c4d.MATERIAL_USE_REFLECTION] = 0 # Disable reflection channel
-                                
-                # Color channel
-                color = c4d.BaseShader(c4d.Xbitmap)
-                color[c4d.BITMAPSHADER_FILENAME] = path
-                mat[c4d.MATERIAL_COLOR_SHADER] = color
-
-                # Get bitmap size
-                irs = c4d.modules.render.InitRenderStruct() # Needed to get shader's bitmap info
-                if color.InitRender(irs)==c4d.INITRENDERRESULT_OK:
-                  bitmap = color.GetBitmap() # Get bitmap
-                  color.FreeRender() # Frees all resources used by this shader
-                  if bitmap is not None: # If there is bitmap
-                    width = bitmap.GetSize()[0] # Get bitmap width in pixels
-                    height = bitmap.GetSize()[1] # Get bitmap height in pixels
-
-                # Luminance channel
-                luminance = c4d.BaseShader(c4d.Xbitmap)
-                luminance[c4d.BITMAPSHADER_FILENAME] = path
-                mat[c4d.MATERIAL_LUMINANCE_SHADER] = luminance
-
-                # Alpha channel
-                alpha = c4d.BaseShader(c4d.Xbitmap)
-                alpha[c4d.BITMAPSHADER_FILENAME] = path
-                mat[c4d.MATERIAL_ALPHA_SHADER] = alpha
-                
-                # Assign shaders to material
-                mat.InsertShader(color) # Insert shader to color channel
-                mat.InsertShader(luminance) # Insert shader to luminance channel
-                mat.InsertShader(alpha) # Insert shader to alpha channel
-                
-                # Other stuff
-                mat.Message(c4d.MSG_UPDATE)
-                mat.Update(True, True) # Update material
-                matname = f.rpartition(".")[0] # Get material name from file path
-                mat.SetName(matname) # Set material name
-                doc.InsertMaterial(mat) # Insert new material to document
-                doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
-
-                if keyMod == "Shift": # If Shift key pressed - Generate planes and assign materials to them
-                    # Create plane
-                    plane = c4d.BaseObject(c4d.Oplane) # Initialize plane object
-                    plane.SetName(matname) # Set plane's name same as the material name
-                    plane[c4d.PRIM_AXIS] = 5 # Set plane's orientation to -z
-                    plane[c4d.PRIM_PLANE_SUBW] = 1 # Set plane's width segments
-                    plane[c4d.PRIM_PLANE_SUBH] = 1 # Set plane's height segments
-                    plane[c4d.PRIM_PLANE_WIDTH] = width # Set plane's width
-                    plane[c4d.PRIM_PLANE_HEIGHT] = height # Set planes height
-                    doc.InsertObject(plane) # Insert plane to document
-                    doc.AddUndo(c4d.UNDOTYPE_NEW, plane) # Add undo command for inserting plane to document
-
-                    # Texture tag
-                    t = c4d.BaseTag(5616) # Initialize texture tag
-                    plane.InsertTag(t) # Insert texture tag to object
-                    tag = plane.GetFirstTag() # Get object's first tag
-                    tag[c4d.TEXTURETAG_MATERIAL] = mat # Set material to texture tag
-                    tag[c4d.TEXTURETAG_PROJECTION] = 6 # Set texture projection to uvw mapping
-                    doc.AddUndo(c4d.UNDOTYPE_NEW, tag) # Add undo command for inserting texture tag to object
-
-    except: # If something went wrong
-        pass # Do nothing
+    recursive = keyMod in ("Ctrl", "Ctrl+Shift") # Scan sub folders too
+    planes = keyMod in ("Shift", "Ctrl+Shift") # Generate planes and assign materials to them
+
+    images = ProbeImages(ScanImages(folder, recursive)) # Read file info in parallel
+
+    # Build everything on the main thread
+    doc.StartUndo() # Start recording undos
+    for image in images: # Loop through images
+        mat = CreateMaterial(image)
+        doc.InsertMaterial(mat) # Insert new material to document
+        doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
+        if planes:
+            plane = CreatePlane(mat, image['size'])
+            doc.InsertObject(plane) # Insert plane to document
+            doc.AddUndo(c4d.UNDOTYPE_NEW, plane) # Add undo command for inserting plane to document
+
+    megabytes = sum(image['bytes'] for image in images) / 1048576.0
+    c4d.StatusSetText("Imported %s image(s), %.1f MB" % (len(images), megabytes))
 
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
@@ -4,37 +4,406 @@ AR_ImportOBJFolder
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportOBJFolder
-Version: 1.0.1
-Description-US: Merges OBJ-files from selected folder to the document
+Version: 1.2.2
+Description-US: Imports OBJ-files from selected folder to the document. Shift: Merges every file with Cinema 4D's OBJ importer. Ctrl: Refreshes import cache
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.2.2 (19.10.2026) - Files with several objects or groups and files with out of range indices are merged with Cinema 4D's importer
+1.2.1 (19.10.2026) - Files with materials are read natively too, materials are created from the MTL-files and shared between objects
+                     Points are read in double precision and faces without uvs don't drop the uvs of other faces
+1.2.0 (19.10.2026) - Import cache in preferences folder, unchanged files are loaded from memory mapped binary arrays instead of parsing
+                     Ctrl: Parses files again and refreshes the import cache
+1.1.0 (19.10.2026) - OBJ-files without materials are read with a streaming parser straight to polygon objects, files with materials are merged as before
+                     Shift: Merges every file with Cinema 4D's OBJ importer
 1.0.1 (28.04.2022) - Updated for R25
 """
 
 # Libraries
 import c4d, os
+import time
+import json
+import mmap
+import struct
+import hashlib
+from array import array
 from c4d import storage as s
 
+# Variables
+CHUNK_SIZE = 1 << 20 # Bytes read at once
+CACHE_LIMIT = 2048 << 20 # Import cache size limit in bytes
+CACHE_VERSION = 3 # Cache files of other versions are discarded
+CACHE_HEADER = struct.Struct('<4sIIIII') # Magic, point, uv, polygon, polygon uv and polygon material array lengths
+MESH_ARRAYS = [('points', 'd'), ('uvs', 'd'), ('polys', 'i'), ('polyUVs', 'i'), ('polyMats', 'i')]
+
+# Classes
+class MeshCache(object):
+    def __init__(self, folder, limit):
+        self.folder = folder # Cache folder
+        self.limit = limit # Size limit in bytes
+        self.indexPath = os.path.join(folder, "index.json")
+        try:
+            with open(self.indexPath) as f:
+                index = json.load(f)
+            if index.get('version') != CACHE_VERSION: # Old cache layout
+                raise ValueError
+            self.entries = index['entries'] # Content hash: {'bytes', 'used', 'merge', 'materials', 'mtllibs'}
+            self.paths = index['paths'] # File path: [size, mtime, content hash]
+        except (OSError, ValueError, KeyError): # No cache yet, broken or old index
+            self.entries = {}
+            self.paths = {}
+            for f in os.listdir(folder): # Remove cache files nothing refers to
+                if f.endswith(".bin"):
+                    try:
+                        os.remove(os.path.join(folder, f))
+                    except OSError:
+                        pass
+
+    def Key(self, path):
+        stat = os.stat(path)
+        record = self.paths.get(path)
+        if record and record[0] == stat.st_size and record[1] == stat.st_mtime: # Unchanged file, no need to hash
+            return record[2]
+        h = hashlib.sha1()
+        with open(path, 'rb') as f: # Hash the content, moved and copied files are found too
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                h.update(chunk)
+        key = h.hexdigest()
+        self.paths[path] = [stat.st_size, stat.st_mtime, key]
+        return key
+
+    def IsMerged(self, key):
+        return self.entries.get(key, {}).get('merge', False) # File has to be merged with Cinema 4D's importer
+
+    def Load(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry.get('merge'):
+            return None
+        try:
+            with open(os.path.join(self.folder, key + ".bin"), 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) # Map the file, no parsing
+                try:
+                    header = CACHE_HEADER.unpack_from(mm, 0)
+                    if header[0] != b'ARO2':
+                        return None
+                    mesh = {'materials': entry.get('materials', []), 'mtllibs': entry.get('mtllibs', [])}
+                    offset = CACHE_HEADER.size
+                    for (name, typecode), count in zip(MESH_ARRAYS, header[1:]):
+                        values = array(typecode)
+                        size = count * values.itemsize
+                        values.frombytes(mm[offset:offset+size])
+                        mesh[name] = values
+                        offset += size
+                finally:
+                    mm.close()
+        except (OSError, ValueError, struct.error): # Missing or broken cache file
+            del self.entries[key]
+            return None
+        entry['used'] = time.time() # Least recently used bookkeeping
+        return mesh
+
+    def Store(self, key, mesh):
+        if mesh is None: # Remember that the file needs Cinema 4D's importer
+            self.entries[key] = {'bytes': 0, 'used': time.time(), 'merge': True}
+            return
+        path = os.path.join(self.folder, key + ".bin")
+        with open(path, 'wb') as f:
+            f.write(CACHE_HEADER.pack(b'ARO2', *[len(mesh[name]) for name, typecode in MESH_ARRAYS]))
+            for name, typecode in MESH_ARRAYS:
+                mesh[name].tofile(f) # Raw binary array
+        self.entries[key] = {'bytes': os.path.getsize(path), 'used': time.time(),
+                             'materials': mesh['materials'], 'mtllibs': mesh['mtllibs']}
+
+    def Evict(self):
+        total = sum(e['bytes'] for e in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]['used']): # Oldest first
+            if total <= self.limit:
+                break
+            entry = self.entries.pop(key)
+            total -= entry['bytes']
+            try:
+                os.remove(os.path.join(self.folder, key + ".bin"))
+            except OSError:
+                pass
+        self.paths = {p: r for p, r in self.paths.items() if r[2] in self.entries}
+
+    def Save(self):
+        self.Evict() # Keep the cache under the size limit
+        with open(self.indexPath, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries, 'paths': self.paths}, f)
+
 # Functions
-def GetFolderSeparator():
-    if c4d.GeGetCurrentOS() == c4d.OPERATINGSYSTEM_WIN: # If operating system is Windows
-        return "\\"
-    else: # If operating system is Mac or Linux
-        return "/"
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
+def GetCacheFolder():
+    folder = s.GeGetC4DPath(c4d.C4D_PATH_PREFS) # Get C4D's preference folder path
+    folder = os.path.join(folder, "aturtur", "AR_ImportOBJFolder") # Import cache folder
+    if not os.path.exists(folder): # If folder doesn't exist
+        os.makedirs(folder) # Create folder
+    return folder
+
+def ReadLines(path):
+    with open(path, 'rb') as f: # Stream the file in chunks, never the whole file in memory
+        rest = b''
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (rest + chunk).split(b'\n')
+            rest = lines.pop() # Incomplete last line, continues in the next chunk
+            for line in lines:
+                yield line
+        if rest:
+            yield rest
+
+def ParseOBJ(path):
+    points = array('d') # Flat x, y, z
+    uvs = array('d') # Flat u, v
+    polys = array('i') # Flat a, b, c, d (d = c for triangles)
+    polyUVs = array('i') # Flat uv indices, same layout as polys, -1 for faces without uvs
+    polyMats = array('i') # Material index of every polygon, -1 for no material
+    materials = [] # Material names in order of appearance
+    mtllibs = [] # Material library file names
+    material = -1
+    for line in ReadLines(path): # Iterate through lines
+        if line[:2] == b'v ': # Vertex
+            x, y, z = line.split()[1:4]
+            points.extend((float(x), float(y), -float(z))) # Flip z, OBJ is right handed
+        elif line[:3] == b'vt ': # Texture coordinate
+            parts = line.split()
+            uvs.extend((float(parts[1]), 1.0 - float(parts[2]) if len(parts) > 2 else 0.0))
+        elif line[:2] == b'f ': # Face
+            vIndices = []
+            tIndices = []
+            pointCount = len(points) // 3
+            uvCount = len(uvs) // 2
+            for corner in line.split()[1:]:
+                refs = corner.split(b'/')
+                v = int(refs[0])
+                v = v - 1 if v > 0 else pointCount + v # Negative index is relative
+                if not 0 <= v < pointCount: # Broken file, let Cinema 4D's importer handle it
+                    raise ValueError("Vertex index out of range")
+                vIndices.append(v)
+                if len(refs) > 1 and refs[1] != b'':
+                    t = int(refs[1])
+                    t = t - 1 if t > 0 else uvCount + t
+                    if not 0 <= t < uvCount:
+                        raise ValueError("Texture coordinate index out of range")
+                    tIndices.append(t)
+            vIndices.reverse() # Reverse winding because of the flipped z
+            tIndices.reverse()
+            if len(tIndices) != len(vIndices): # Face without uvs
+                tIndices = [-1] * len(vIndices)
+            n = len(vIndices)
+            if n in (3, 4): # Triangle or quad
+                polys.extend((vIndices + vIndices[-1:])[:4])
+                polyUVs.extend((tIndices + tIndices[-1:])[:4])
+                polyMats.append(material)
+            elif n > 4: # N-gon, triangle fan
+                for k in range(1, n - 1):
+                    polys.extend((vIndices[0], vIndices[k], vIndices[k+1], vIndices[k+1]))
+                    polyUVs.extend((tIndices[0], tIndices[k], tIndices[k+1], tIndices[k+1]))
+                    polyMats.append(material)
+        elif line[:2] in (b'o ', b'g ') and len(polys) != 0: # Several objects, Cinema 4D's importer splits them
+            return None
+        elif line[:7] == b'usemtl ': # Material of the following faces
+            name = line[7:].strip().decode('utf-8', 'replace')
+            if name not in materials:
+                materials.append(name)
+            material = materials.index(name)
+        elif line[:7] == b'mtllib ': # Material library
+            mtllibs.append(line[7:].strip().decode('utf-8', 'replace'))
+    if len(uvs) == 0 or max(polyUVs, default=-1) < 0: # No uvs at all
+        polyUVs = array('i')
+    return {'points': points, 'uvs': uvs, 'polys': polys, 'polyUVs': polyUVs, 'polyMats': polyMats,
+            'materials': materials, 'mtllibs': mtllibs}
+
+def BuildPolygonObject(name, mesh):
+    points = mesh['points']
+    polys = mesh['polys']
+    pointCount = len(points) // 3
+    polyCount = len(polys) // 4
+    op = c4d.PolygonObject(pointCount, polyCount) # Initialize polygon object
+    op.SetName(name)
+    op.SetAllPoints([c4d.Vector(points[i], points[i+1], points[i+2]) for i in range(0, len(points), 3)]) # Set all points at once
+    for i in range(polyCount): # Set polygons
+        j = i * 4
+        op.SetPolygon(i, c4d.CPolygon(polys[j], polys[j+1], polys[j+2], polys[j+3]))
+
+    polyUVs = mesh['polyUVs']
+    if len(polyUVs) != 0: # UVW tag
+        uvs = mesh['uvs']
+        uvw = c4d.UVWTag(polyCount)
+        vectors = [c4d.Vector(uvs[i], uvs[i+1], 0) for i in range(0, len(uvs), 2)]
+        vectors.append(c4d.Vector(0, 0, 0)) # Index -1, faces without uvs
+        for i in range(polyCount):
+            j = i * 4
+            uvw.SetSlow(i, vectors[polyUVs[j]], vectors[polyUVs[j+1]], vectors[polyUVs[j+2]], vectors[polyUVs[j+3]])
+        op.InsertTag(uvw)
+
+    phong = c4d.BaseTag(c4d.Tphong) # Phong tag for smooth shading
+    phong[c4d.PHONGTAG_PHONG_ANGLELIMIT] = True
+    op.InsertTag(phong)
+    op.Message(c4d.MSG_UPDATE)
+    return op
+
+def ReadMTL(path):
+    materials = {} # Material name: {'color', 'texture', 'alpha'}
+    current = None
+    folder = os.path.dirname(path)
+    try:
+        for line in ReadLines(path): # Iterate through lines
+            parts = line.strip().decode('utf-8', 'replace').split()
+            if len(parts) < 2:
+                continue
+            if parts[0] == "newmtl": # New material
+                current = {'color': (0.8, 0.8, 0.8), 'texture': None, 'alpha': 1.0}
+                materials[" ".join(parts[1:])] = current
+            elif current is None:
+                continue
+            elif parts[0] == "Kd" and len(parts) >= 4: # Diffuse color
+                current['color'] = (float(parts[1]), float(parts[2]), float(parts[3]))
+            elif parts[0] == "map_Kd": # Diffuse texture, options come before the file name
+                current['texture'] = os.path.join(folder, parts[-1])
+            elif parts[0] == "d": # Dissolve
+                current['alpha'] = float(parts[1])
+            elif parts[0] == "Tr": # Transparency
+                current['alpha'] = 1.0 - float(parts[1])
+    except (OSError, ValueError): # Missing or broken material library
+        pass
+    return materials
+
+def CreateMaterial(name, data):
+    mat = c4d.BaseMaterial(c4d.Mmaterial) # Initialize a material
+    mat.SetName(name)
+    mat[c4d.MATERIAL_COLOR_COLOR] = c4d.Vector(*data['color'])
+    if data['texture'] is not None: # Bitmap shader to color channel
+        shader = c4d.BaseShader(c4d.Xbitmap)
+        shader[c4d.BITMAPSHADER_FILENAME] = data['texture']
+        mat[c4d.MATERIAL_COLOR_SHADER] = shader
+        mat.InsertShader(shader)
+    if data['alpha'] < 1.0: # Transparency channel
+        mat[c4d.MATERIAL_USE_TRANSPARENCY] = True
+        mat[c4d.MATERIAL_TRANSPARENCY_BRIGHTNESS] = 1.0 - data['alpha']
+    mat.Message(c4d.MSG_UPDATE)
+    mat.Update(True, True) # Update material
+    return mat
+
+def AssignMaterials(doc, op, mesh, folder, libraries, created):
+    names = mesh['materials']
+    if len(names) == 0:
+        return
+    definitions = {} # Material name: definition from the object's material libraries
+    for lib in mesh['mtllibs']:
+        path = os.path.join(folder, lib)
+        if path not in libraries: # Every library is read only once
+            libraries[path] = ReadMTL(path)
+        for name, data in libraries[path].items():
+            definitions.setdefault(name, (path, data))
+    polyMats = mesh['polyMats']
+    used = sorted(set(polyMats) - {-1})
+    for index in used: # Loop through materials the object uses
+        name = names[index]
+        path, data = definitions.get(name, (None, {'color': (0.8, 0.8, 0.8), 'texture': None, 'alpha': 1.0}))
+        mat = created.get((path, name)) # Same material of the same library is created only once
+        if mat is None:
+            mat = CreateMaterial(name, data)
+            doc.InsertMaterial(mat) # Insert material to document
+            doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting material
+            created[(path, name)] = mat
+        tag = c4d.BaseTag(c4d.Ttexture) # Initialize texture tag
+        tag[c4d.TEXTURETAG_MATERIAL] = mat
+        tag[c4d.TEXTURETAG_PROJECTION] = c4d.TEXTURETAG_PROJECTION_UVW
+        if len(used) > 1 or -1 in polyMats: # Restrict to the polygons of the material
+            selection = c4d.SelectionTag(c4d.Tpolygonselection)
+            selection.SetName(name)
+            bs = selection.GetBaseSelect()
+            for i, m in enumerate(polyMats):
+                if m == index:
+                    bs.Select(i)
+            op.InsertTag(selection)
+            tag[c4d.TEXTURETAG_RESTRICTION] = name
+        op.InsertTag(tag, op.GetLastTag())
+
+def CollectFiles(folder, extensions):
+    files = [] # Initialize a list for file paths
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.rpartition(".")[-1].lower() in extensions: # If extension matches
+                files.append(entry.path)
+    return sorted(files)
 
 def main():
+    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
     extensions = ["obj"] # File extensions that will be imported
-    separator = GetFolderSeparator() # Get path separator
     folder = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select folder to import',c4d.FILESELECT_DIRECTORY,'') # Load folder
     if not folder: return # If there is no folder, stop the script
-    files = os.listdir(folder) # Get files
-    for f in files: # Loop through files
-        ext = f.rsplit(".",1) # Get file extension
-        if ext[1] in extensions: # If extension matches
-            c4d.documents.MergeDocument(doc, folder+separator+f, c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS) # Merge file to current project
+    keyMod = GetKeyMod() # Get keymodifier
+    mergeAll = keyMod == "Shift" # Use Cinema 4D's importer for every file
+    refresh = keyMod == "Ctrl" # Parse again and refresh the import cache
+
+    files = CollectFiles(folder, extensions) # Get files
+    cache = MeshCache(GetCacheFolder(), CACHE_LIMIT) # Import cache
+    start = time.time()
+    merged = 0
+    cached = 0
+    libraries = {} # Material library path: parsed materials
+    created = {} # (library path, material name): material
+    doc.StartUndo() # Start recording undos
+    for i, path in enumerate(files): # Loop through files
+        c4d.StatusSetBar(int(100.0 * i / max(len(files), 1)))
+        mesh = None
+        if not mergeAll:
+            key = cache.Key(path)
+            mesh = None if refresh else cache.Load(key) # Cached geometry
+            if mesh is not None:
+                cached += 1
+            elif refresh or not cache.IsMerged(key):
+                try:
+                    mesh = ParseOBJ(path) # Read file natively
+                except (ValueError, IndexError): # Unexpected syntax
+                    mesh = None
+                cache.Store(key, mesh)
+        if mesh is None: # Several objects, unreadable or Shift, use Cinema 4D's importer
+            c4d.documents.MergeDocument(doc, path, c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS) # Merge file to current project
+            merged += 1
+            continue
+        op = BuildPolygonObject(os.path.basename(path).rpartition(".")[0], mesh)
+        AssignMaterials(doc, op, mesh, folder, libraries, created) # Materials from the MTL-files
+        doc.InsertObject(op) # Insert object to document
+        doc.AddUndo(c4d.UNDOTYPE_NEW, op) # Add undo command for inserting object
+    doc.EndUndo() # Stop recording undos
+    cache.Save() # Write cache index
+
+    elapsed = max(time.time() - start, 0.001)
+    c4d.StatusClear()
+    c4d.StatusSetText("Imported %s file(s) in %.1f s (%.1f files/s), %s from cache, %s merged" % (len(files), elapsed, len(files) / elapsed, cached, merged))
     c4d.EventAdd() # Update Cinema 4D
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
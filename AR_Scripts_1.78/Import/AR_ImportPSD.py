@@ -4,8 +4,8 @@ AR_ImportPSD
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportPSD
-Version: 1.0.0
-Description-US: Import PSD-file's layers to separate materials. Shift: Generates also image planes.
+Version: 1.2.1
+Description-US: Import PSD-file's layers to separate materials. Shift: Generates also image planes. Ctrl: Includes layers inside groups.
 
 Written for Maxon Cinema 4D R25.117
 Python version 3.9.1
@@ -13,15 +13,166 @@ Python version 3.9.1
 http://www.plugincafe.com/forum/forum_posts.asp?TID=13697
 
 Change log:
+1.2.1 (19.10.2026) - Image planes are sized and placed by the layer bounds, layer opacity is set to the material's transparency
+1.2.0 (19.10.2026) - Layer info (names, bounds, visibility, opacity, groups) is read straight from the file without loading it to BodyPaint
+                     Hidden layers get hidden planes. Ctrl: Includes layers inside groups
+1.1.0 (19.10.2026) - Canvas size is read once from the file header, bitmap is loaded only if the header is unreadable
 1.0.0 (11.04.2022) - Initial version
 """
 
 # Libraries
 import c4d, os
+import struct
 from c4d.modules import bodypaint as bp
 from c4d import storage as s
 
 # Functions
+def ReadCString(f):
+    chars = b'' # Initialize bytes for null terminated string
+    while True:
+        c = f.read(1)
+        if c in (b'', b'\x00'):
+            return chars
+        chars += c
+
+def ParseImageHeader(f):
+    head = f.read(32) # Signatures and fixed headers fit here
+    if head[:8] == b'\x89PNG\r\n\x1a\n': # PNG, IHDR chunk is always first
+        return struct.unpack('>II', head[16:24])
+    if head[:4] == b'8BPS': # PSD
+        height, width = struct.unpack('>II', head[14:22])
+        return width, height
+    if head[:4] == b'\x76\x2f\x31\x01': # EXR, read header attributes until 'dataWindow'
+        f.seek(8)
+        while True:
+            name = ReadCString(f)
+            if name == b'': # End of header
+                return None
+            ReadCString(f) # Attribute type
+            size = struct.unpack('<i', f.read(4))[0]
+            if name == b'dataWindow':
+                xMin, yMin, xMax, yMax = struct.unpack('<iiii', f.read(16))
+                return xMax - xMin + 1, yMax - yMin + 1
+            f.seek(size, 1) # Skip attribute value
+    if head[:2] == b'\xff\xd8': # JPEG, jump from segment to segment until SOF marker
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) != 2 or marker[0] != 0xFF:
+                return None
+            while marker[1] == 0xFF: # Fill bytes
+                marker = marker[1:] + f.read(1)
+            code = marker[1]
+            if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7: # Markers without length
+                continue
+            length = struct.unpack('>H', f.read(2))[0]
+            if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC): # Start of frame
+                height, width = struct.unpack('>xHH', f.read(5))
+                return width, height
+            f.seek(length - 2, 1) # Skip segment
+    if head[:4] in (b'II*\x00', b'MM\x00*'): # TIFF, read the first IFD
+        endian = '<' if head[:2] == b'II' else '>'
+        f.seek(struct.unpack(endian + 'I', head[4:8])[0])
+        count = struct.unpack(endian + 'H', f.read(2))[0]
+        entries = f.read(count * 12)
+        size = {}
+        for i in range(count):
+            tag, valueType = struct.unpack(endian + 'HH', entries[i*12:i*12+4])
+            if tag in (256, 257): # Image width, image length
+                fmt = 'H' if valueType == 3 else 'I'
+                size[tag] = struct.unpack(endian + fmt, entries[i*12+8:i*12+8+struct.calcsize(fmt)])[0]
+        if 256 in size and 257 in size:
+            return size[256], size[257]
+        return None
+    if len(head) >= 18 and head[2] in (1, 2, 3, 9, 10, 11): # TGA, no signature, check image type
+        width, height = struct.unpack('<HH', head[12:16])
+        if width > 0 and height > 0:
+            return width, height
+    return None
+
+def ReadImageSize(path):
+    try:
+        with open(path, 'rb') as f: # Read only the header, not the pixels
+            return ParseImageHeader(f)
+    except (OSError, struct.error, IndexError):
+        return None
+
+def GetImageSize(path, shader):
+    size = ReadImageSize(path) # Try the file header first
+    if size is not None:
+        return size
+    irs = c4d.modules.render.InitRenderStruct() # Needed to get shader's bitmap info
+    if shader.InitRender(irs) == c4d.INITRENDERRESULT_OK: # Fallback, loads the whole bitmap
+        bitmap = shader.GetBitmap() # Get bitmap
+        shader.FreeRender() # Frees all resources used by this shader
+        if bitmap is not None: # If there is bitmap
+            return bitmap.GetSize() # Get bitmap width and height in pixels
+    return None
+
+def ReadPSDLayers(path):
+    with open(path, 'rb') as f: # Read only the layer records, pixel data is never touched
+        signature, version, channels, height, width, depth, mode = struct.unpack('>4sH6xHIIHH', f.read(26))
+        if signature != b'8BPS' or version != 1: # Not PSD (or large document format)
+            return None
+        for section in range(2): # Skip color mode data and image resources
+            f.seek(struct.unpack('>I', f.read(4))[0], 1)
+        if struct.unpack('>I', f.read(4))[0] == 0: # No layer and mask info
+            return width, height, []
+        if struct.unpack('>I', f.read(4))[0] == 0: # No layer info
+            return width, height, []
+        count = abs(struct.unpack('>h', f.read(2))[0]) # Negative count means merged alpha
+        records = [] # Layer records, bottom to top
+        for i in range(count):
+            top, left, bottom, right, channelCount = struct.unpack('>iiiiH', f.read(18))
+            f.seek(channelCount * 6, 1) # Channel info
+            signature, blend, opacity, clipping, flags, extraLength = struct.unpack('>4s4sBBBxI', f.read(16))
+            extraEnd = f.tell() + extraLength
+            f.seek(struct.unpack('>I', f.read(4))[0], 1) # Layer mask data
+            f.seek(struct.unpack('>I', f.read(4))[0], 1) # Blending ranges
+            nameLength = f.read(1)[0]
+            name = f.read(nameLength).decode('latin-1') # Pascal string
+            f.seek((4 - (nameLength + 1) % 4) % 4, 1) # Padded to multiple of 4
+            section = 0
+            while f.tell() + 12 <= extraEnd: # Additional layer information
+                signature, key, length = struct.unpack('>4s4sI', f.read(12))
+                if key == b'luni': # Unicode name
+                    data = f.read(length)
+                    name = data[4:4 + struct.unpack('>I', data[:4])[0] * 2].decode('utf-16-be')
+                elif key in (b'lsct', b'lsdk'): # Section divider (group)
+                    data = f.read(length)
+                    section = struct.unpack('>I', data[:4])[0]
+                else:
+                    f.seek(length, 1)
+            f.seek(extraEnd)
+            records.append({'name': name,
+                            'bounds': (left, top, right, bottom),
+                            'visible': not flags & 2,
+                            'opacity': opacity / 255.0,
+                            'section': section})
+
+    layers = [] # Layers, top to bottom
+    parents = [] # Open groups
+    for r in reversed(records): # Photoshop's layer panel order
+        if r['section'] == 3: # End of group
+            if parents:
+                parents.pop()
+            continue
+        r['group'] = r['section'] in (1, 2) # Open or closed folder
+        r['depth'] = len(parents)
+        r['parent'] = parents[-1] if parents else None
+        layers.append(r)
+        if r['group']:
+            parents.append(r['name'])
+    return width, height, layers
+
+def LayerRect(layer, width, height):
+    left, top, right, bottom = layer.get('bounds', (0, 0, width, height))
+    left, top = max(left, 0), max(top, 0) # Only the part inside the canvas is visible
+    right, bottom = min(right, width), min(bottom, height)
+    if right <= left or bottom <= top: # Empty layer or group, use the canvas
+        return 0, 0, width, height
+    return left, top, right, bottom
+
 def GetKeyMod():
     bc = c4d.BaseContainer() # Initialize a base container
     keyMod = "None" # Initialize a keyboard modifier status
@@ -77,15 +228,27 @@ def main():
     extension = file.rpartition(".")[-1].lower()
     if extension != "psd": return None # Break if not PSD file
 
-    # Preparing texture and layers
-    bc = c4d.BaseContainer()
-    bc.SetFilename(c4d.LOADTEXTURE_FILENAME, file)
-    tex = bp.SendPainterCommand(c4d.PAINTER_LOADTEXTURE, doc, tex=None, bc=bc)
-    layers = CollectLayers(tex.GetFirstLayer())
+    # Preparing layers
+    try:
+        psd = ReadPSDLayers(file) # Layer info straight from the file
+    except (OSError, struct.error, IndexError, UnicodeDecodeError):
+        psd = None
+    tex = None
+    size = None # Canvas size
+    if psd is not None:
+        width, height, layers = psd
+        size = (width, height)
+        if keyMod not in ("Ctrl", "Ctrl+Shift"): # Only top level layers and groups
+            layers = [l for l in layers if l['depth'] == 0]
+    else: # Fallback, load the file with BodyPaint
+        bc = c4d.BaseContainer()
+        bc.SetFilename(c4d.LOADTEXTURE_FILENAME, file)
+        tex = bp.SendPainterCommand(c4d.PAINTER_LOADTEXTURE, doc, tex=None, bc=bc)
+        layers = [{'name': l.GetName(), 'visible': True} for l in CollectLayers(tex.GetFirstLayer())]
 
     for i, l in enumerate(layers): #  Iterate through layers
 
-        layerName     = l.GetName()
+        layerName     = l['name']
 
         layerSet      = c4d.LayerSet()
         layerSetAlpha = c4d.LayerSet()
@@ -97,20 +260,22 @@ def main():
         mat  = c4d.BaseMaterial(c4d.Mmaterial)
         mat[c4d.MATERIAL_USE_REFLECTION] = 0 # Disable reflection channel
         mat[c4d.MATERIAL_USE_ALPHA] = 1 # Enable alpha channel
+        opacity = l.get('opacity', 1.0) # Layer opacity
+        if opacity < 1.0:
+            mat[c4d.MATERIAL_USE_TRANSPARENCY] = 1 # Enable transparency channel
+            mat[c4d.MATERIAL_TRANSPARENCY_BRIGHTNESS] = 1.0 - opacity
 
         # Color channel
         color = c4d.BaseShader(c4d.Xbitmap)
         color[c4d.BITMAPSHADER_FILENAME] = file
         color[c4d.BITMAPSHADER_LAYERSET] = layerSet
         mat[c4d.MATERIAL_COLOR_SHADER]   = color
-        # Get bitmap size
-        irs = c4d.modules.render.InitRenderStruct() # Needed to get shader's bitmap info
-        if color.InitRender(irs)==c4d.INITRENDERRESULT_OK:
-          bitmap = color.GetBitmap() # Get bitmap
-          color.FreeRender() # Frees all resources used by this shader
-          if bitmap is not None: # If there is bitmap
-            width  = bitmap.GetSize()[0] # Get bitmap width in pixels
-            height = bitmap.GetSize()[1] # Get bitmap height in pixels
+        # Get bitmap size, layers share the canvas size so read it only once
+        if size is None:
+            size = GetImageSize(file, color) # Read from the file header, bitmap as fallback
+            if size is not None:
+                width  = size[0] # Get bitmap width in pixels
+                height = size[1] # Get bitmap height in pixels
 
         # Luminance channel
         luminance = c4d.BaseShader(c4d.Xbitmap)
@@ -138,16 +303,22 @@ def main():
         doc.InsertMaterial(mat) # Insert new material to document
         doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
 
-        if keyMod == "Shift": # If Shift key pressed - Generate planes and assign materials to them
+        if keyMod in ("Shift", "Ctrl+Shift"): # If Shift key pressed - Generate planes and assign materials to them
             # Create plane
             plane = c4d.BaseObject(c4d.Oplane) # Initialize plane object
             plane.SetName(matname) # Set plane's name same as the material name
             plane[c4d.PRIM_AXIS] = 5 # Set plane's orientation to -z
             plane[c4d.PRIM_PLANE_SUBW] = 1 # Set plane's width segments
             plane[c4d.PRIM_PLANE_SUBH] = 1 # Set plane's height segments
-            plane[c4d.PRIM_PLANE_WIDTH]  = width # Set plane's width
-            plane[c4d.PRIM_PLANE_HEIGHT] = height # Set planes height
+            left, top, right, bottom = LayerRect(l, width, height) # Layer's pixels on the canvas
+            plane[c4d.PRIM_PLANE_WIDTH]  = right - left # Set plane's width
+            plane[c4d.PRIM_PLANE_HEIGHT] = bottom - top # Set planes height
+            plane[c4d.ID_BASEOBJECT_REL_POSITION,c4d.VECTOR_X] = (left + right) / 2.0 - width / 2.0 # Same place as on the canvas
+            plane[c4d.ID_BASEOBJECT_REL_POSITION,c4d.VECTOR_Y] = height / 2.0 - (top + bottom) / 2.0
             plane[c4d.ID_BASEOBJECT_REL_POSITION,c4d.VECTOR_Z] = i*100
+            if not l['visible']: # Hidden layer
+                plane[c4d.ID_BASEOBJECT_VISIBILITY_EDITOR] = 1 # Off
+                plane[c4d.ID_BASEOBJECT_VISIBILITY_RENDER] = 1 # Off
             doc.InsertObject(plane) # Insert plane to document
             doc.AddUndo(c4d.UNDOTYPE_NEW, plane) # Add undo command for inserting plane to document
 
@@ -157,9 +328,14 @@ def main():
             tag = plane.GetFirstTag() # Get object's first tag
             tag[c4d.TEXTURETAG_MATERIAL]   = mat # Set material to texture tag
             tag[c4d.TEXTURETAG_PROJECTION] = 6 # Set texture projection to uvw mapping
+            tag[c4d.TEXTURETAG_LENGTHX] = float(width) / (right - left) # Canvas relative to the plane
+            tag[c4d.TEXTURETAG_LENGTHY] = float(height) / (bottom - top)
+            tag[c4d.TEXTURETAG_OFFSETX] = -float(left) / (right - left) # Crop the canvas to the layer
+            tag[c4d.TEXTURETAG_OFFSETY] = -float(top) / (bottom - top)
             doc.AddUndo(c4d.UNDOTYPE_NEW, tag) # Add undo command for inserting texture tag to object
 
-    bp.SendPainterCommand(c4d.PAINTER_FORCECLOSETEXTURE, doc, tex=tex, bc=c4d.BaseContainer())
+    if tex is not None:
+        bp.SendPainterCommand(c4d.PAINTER_FORCECLOSETEXTURE, doc, tex=tex, bc=c4d.BaseContainer())
 
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
@@ -4,45 +4,272 @@ AR_ImportPixeur
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportPixeur
-Version: 1.0.1
-Description-US: Create materials from Pixeur color palette file
+Version: 1.1.0
+Description-US: Create materials from Pixeur color palette file. Shift: Index palette library folder. Ctrl: Search palette library by name or nearest color
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.0 (19.10.2026) - Reads GIMP and plain hex palettes too. Materials are created in one undo step and colors that already have a material are reused
+                     Shift: Indexes a palette library folder to a single index file
+                     Ctrl: Searches the library by name or nearest color (#rrggbb) and imports the best match
 1.0.1 (28.03.2022) - R25 support
 """
 # Libraries
 import c4d
+import os
+import re
+import json
+import heapq
+import struct
+from array import array
 from c4d import storage as s
+from c4d import gui
+
+# Global variables
+PALETTE_FORMATS = ["txt", "gpl", "hex"] # Pixeur, GIMP and plain hex palettes
+INDEX_HEADER = struct.Struct('<4sII') # Magic, JSON size, color bytes
+hexColor = re.compile(r"^#?([0-9a-fA-F]{6})$") # Hex color, e.g. '#ff8800'
+
+# Classes
+class PaletteLibrary(object):
+    def __init__(self, path):
+        self.path = path # Index file path
+        self.root = "" # Library folder
+        self.palettes = [] # [file path, mtime, name, offset, count, color names]
+        self.colors = array('B') # Packed RGB values of every palette
+        self.tree = None # K-d tree, built when needed
+        try:
+            with open(path, 'rb') as f:
+                magic, jsonSize, colorSize = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic == b'ARPL':
+                    index = json.loads(f.read(jsonSize).decode('utf-8'))
+                    self.colors.frombytes(f.read(colorSize))
+                    self.root = index['root']
+                    self.palettes = index['palettes']
+        except (OSError, ValueError, KeyError, struct.error): # No index yet or broken index
+            self.palettes = []
+            self.colors = array('B')
+
+    def Save(self):
+        data = json.dumps({'root': self.root, 'palettes': self.palettes}).encode('utf-8')
+        with open(self.path, 'wb') as f:
+            f.write(INDEX_HEADER.pack(b'ARPL', len(data), len(self.colors)))
+            f.write(data)
+            f.write(self.colors.tobytes())
+
+    def Refresh(self, root):
+        old = {} # File path: [mtime, colors, names], unchanged files are not parsed again
+        if root == self.root:
+            for path, mtime, name, offset, count, names in self.palettes:
+                old[path] = [mtime, name, self.colors[offset*3:(offset+count)*3], names]
+        self.root = root
+        self.palettes = []
+        self.colors = array('B')
+        self.tree = None
+        for folder, dirs, files in os.walk(root): # Loop through library folder
+            dirs.sort()
+            for f in sorted(files):
+                if f.rpartition(".")[2].lower() not in PALETTE_FORMATS:
+                    continue
+                path = os.path.join(folder, f)
+                mtime = os.path.getmtime(path)
+                record = old.get(path)
+                if record is not None and record[0] == mtime:
+                    name, colors, names = record[1], record[2], record[3]
+                else:
+                    name, rgb, names = ReadPalette(path)
+                    colors = array('B', [c for color in rgb for c in color])
+                if len(colors) == 0:
+                    continue
+                self.palettes.append([path, mtime, name, len(self.colors) // 3, len(colors) // 3, names])
+                self.colors.extend(colors)
+        self.Save()
+
+    def Colors(self, i):
+        path, mtime, name, offset, count, names = self.palettes[i]
+        values = self.colors[offset*3:(offset+count)*3]
+        return [tuple(values[j:j+3]) for j in range(0, len(values), 3)], names
+
+    def Search(self, text):
+        text = text.lower()
+        return [i for i, palette in enumerate(self.palettes) if text in palette[2].lower()]
+
+    def Nearest(self, color, count):
+        if self.tree is None: # Palette index and color index of every color
+            points = []
+            for i, palette in enumerate(self.palettes):
+                offset = palette[3]
+                for j in range(palette[4]):
+                    points.append((tuple(self.colors[(offset+j)*3:(offset+j)*3+3]), i, j))
+            self.tree = BuildTree(points, 0)
+        heap = [] # Max heap of the best matches, (-distance, palette, color)
+        SearchTree(self.tree, color, count, heap)
+        return [(-d, i, j) for d, i, j in sorted(heap, reverse=True)]
 
 # Functions
-def main():
-    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
-    doc.StartUndo() # Start recording undos
-    fn = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select pixeur palette',c4d.FILESELECT_LOAD,'') # File dialog
-    if fn is None: return # If no file, exit
-    f = open(fn) # Open file
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
+def GetIndexPath():
+    folder = s.GeGetC4DPath(c4d.C4D_PATH_PREFS) # Get C4D's preference folder path
+    folder = os.path.join(folder, "aturtur") # Aturtur folder
+    if not os.path.exists(folder): # If folder doesn't exist
+        os.makedirs(folder) # Create folder
+    return os.path.join(folder, "AR_ImportPixeur.bin")
+
+def ReadPalette(path):
+    name = os.path.basename(path).rpartition(".")[0] # Palette name from file name
+    colors = [] # (r, g, b) in 0-255
+    names = [] # Color names
+    f = open(path, errors='ignore') # Open file
     try: # Try to execute following script
-        for line in f: # Loop trhough lines in Pixeur color palette file
-            if line.startswith("R"): # If line starts with letter R
+        for line in f: # Loop through lines in palette file
+            line = line.strip()
+            if line.startswith("R:"): # Pixeur, 'R:255 G:128 B:0, ...'
                 line = line.split(" ") # Split line to list
                 r    = line[0][2:] # Red channel value
                 g    = line[1][2:] # Green channel value
-                line = line[2].split(",") # Split line new list
-                b    = line[0][2:] # Blue channel value
-                mat  = c4d.BaseMaterial(c4d.Mmaterial) # Initialize new material
-                color= c4d.Vector(float(r) / 255, float(g) / 255, float(b) / 255) # Convert rgb colors to c4d format
-                mat[c4d.MATERIAL_COLOR_COLOR] = color # Set color channel color
-                mat[c4d.MATERIAL_LUMINANCE_COLOR] = color # Set luminance channel color
-                doc.InsertMaterial(mat) # Insert material to document
-                doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
-    except: # If something went wrong
-        pass # Do nothing
+                b    = line[2].split(",")[0][2:] # Blue channel value
+                colors.append((int(r), int(g), int(b)))
+                names.append("")
+            elif line.startswith("Name:"): # GIMP palette name
+                name = line[5:].strip()
+            elif hexColor.match(line): # Plain hex color
+                value = hexColor.match(line).group(1)
+                colors.append((int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)))
+                names.append("")
+            else: # GIMP palette, 'r g b name'
+                values = line.split(None, 3)
+                if len(values) >= 3 and all(v.isdigit() for v in values[:3]):
+                    colors.append((int(values[0]), int(values[1]), int(values[2])))
+                    names.append(values[3] if len(values) > 3 else "")
+    except (ValueError, IndexError): # If something went wrong
+        pass # Keep colors that were read
+    f.close() # Close file
+    colors = [tuple(min(255, max(0, c)) for c in color) for color in colors] # Clamp to 0-255
+    return name, colors, names
+
+def BuildTree(points, axis):
+    if len(points) == 0:
+        return None
+    points.sort(key=lambda p: p[0][axis]) # Split on the median
+    median = len(points) // 2
+    return (points[median], axis,
+            BuildTree(points[:median], (axis + 1) % 3),
+            BuildTree(points[median+1:], (axis + 1) % 3))
+
+def SearchTree(node, color, count, heap):
+    if node is None:
+        return
+    point, axis, left, right = node
+    rgb = point[0]
+    distance = (rgb[0]-color[0])**2 + (rgb[1]-color[1])**2 + (rgb[2]-color[2])**2
+    if len(heap) < count:
+        heapq.heappush(heap, (-distance, point[1], point[2]))
+    elif distance < -heap[0][0]:
+        heapq.heapreplace(heap, (-distance, point[1], point[2]))
+    delta = color[axis] - rgb[axis]
+    near, far = (left, right) if delta < 0 else (right, left)
+    SearchTree(near, color, count, heap)
+    if len(heap) < count or delta * delta < -heap[0][0]: # Other side can still have closer colors
+        SearchTree(far, color, count, heap)
+
+def ColorKey(vector):
+    return (int(round(vector.x * 255)), int(round(vector.y * 255)), int(round(vector.z * 255)))
+
+def ImportPalette(doc, colors, names):
+    existing = {} # Color: material, reuse materials that are already in the document
+    for m in doc.GetMaterials():
+        if m.GetType() == c4d.Mmaterial:
+            existing.setdefault(ColorKey(m[c4d.MATERIAL_COLOR_COLOR]), m)
+    created = 0
+    reused = 0
+    doc.StartUndo() # Start recording undos
+    for (r, g, b), name in zip(colors, names): # Loop through palette colors
+        if (r, g, b) in existing:
+            reused += 1
+            continue
+        mat  = c4d.BaseMaterial(c4d.Mmaterial) # Initialize new material
+        color= c4d.Vector(float(r) / 255, float(g) / 255, float(b) / 255) # Convert rgb colors to c4d format
+        mat[c4d.MATERIAL_COLOR_COLOR] = color # Set color channel color
+        mat[c4d.MATERIAL_LUMINANCE_COLOR] = color # Set luminance channel color
+        if name != "":
+            mat.SetName(name) # Set material name
+        doc.InsertMaterial(mat) # Insert material to document
+        doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
+        existing[(r, g, b)] = mat
+        created += 1
     doc.EndUndo() # Stop recording undos
+    return created, reused
+
+def main():
+    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
+    keyMod = GetKeyMod() # Get keymodifier
+
+    if keyMod == "Shift": # Index palette library
+        library = PaletteLibrary(GetIndexPath())
+        folder = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select palette library folder',c4d.FILESELECT_DIRECTORY,'',library.root)
+        if not folder: return # If no folder, exit
+        library.Refresh(folder)
+        c4d.StatusSetText("Indexed %s palettes, %s colors" % (len(library.palettes), len(library.colors) // 3))
+        return
+
+    if keyMod == "Ctrl": # Search palette library
+        library = PaletteLibrary(GetIndexPath())
+        if len(library.palettes) == 0:
+            gui.MessageDialog("Palette library is not indexed! Run the script with Shift first.")
+            return
+        query = gui.InputDialog('Palette name or hex color', "")
+        if not query: return
+        match = hexColor.match(query.strip())
+        if match: # Nearest color query
+            value = match.group(1)
+            color = (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16))
+            results = [i for d, i, j in library.Nearest(color, 10)]
+            results = list(dict.fromkeys(results)) # Unique palettes, closest first
+        else: # Name search
+            results = library.Search(query)
+        if len(results) == 0:
+            gui.MessageDialog("No palettes found!")
+            return
+        for i in results:
+            print("AR_ImportPixeur: %s (%s)" % (library.palettes[i][2], library.palettes[i][0]))
+        colors, names = library.Colors(results[0]) # Import the best match
+        created, reused = ImportPalette(doc, colors, names)
+    else: # Import palette file
+        fn = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select pixeur palette',c4d.FILESELECT_LOAD,'') # File dialog
+        if fn is None: return # If no file, exit
+        name, colors, names = ReadPalette(fn)
+        created, reused = ImportPalette(doc, colors, names)
+
+    c4d.StatusSetText("Created %s materials, reused %s" % (created, reused))
     c4d.EventAdd() # Refresh Cinema 4D
 
 # Execute main()
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
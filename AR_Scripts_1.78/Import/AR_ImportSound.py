@@ -4,28 +4,165 @@ AR_ImportSound
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportSound
-Version: 1.0
-Description-US: Imports sound file starting at the current time
+Version: 1.1.0
+Description-US: Imports sound file starting at the current time. Shift: Creates keyframed amplitude user data too
 
 Written for Maxon Cinema 4D R25.117
 Python version 3.9.1
 
+Change log:
+1.1.0 (19.10.2026) - Stores per frame min, max and RMS envelope of WAV and AIFF files to the sound null
+                     Shift: Creates keyframed Min, Max and RMS user data channels from the envelope
 """
 # Libraries
 import os
 import c4d
+import math
+import wave
+import base64
+from array import array
 from c4d import storage as s
+try:
+    import aifc
+except ImportError: # Removed from Python 3.13
+    aifc = None
+
+# Global variables
+CHUNK_FRAMES = 65536 # Audio frames read at once
+
+# Functions
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
+def OpenAudio(path):
+    extension = path.rpartition(".")[2].lower()
+    if extension in ("aif", "aiff", "aifc"):
+        if aifc is None:
+            return None, False
+        return aifc.open(path, 'rb'), True # AIFF samples are big-endian and signed
+    if extension == "wav":
+        return wave.open(path, 'rb'), False
+    return None, False
+
+def DecodeSamples(data, width, bigEndian):
+    if width == 1: # 8-bit, WAV is unsigned and AIFF signed
+        samples = array('b', bytes((b - 128) & 0xFF for b in data) if not bigEndian else data)
+    elif width == 2:
+        samples = array('h', data)
+    elif width == 3: # 24-bit, padded to 32-bit
+        padded = bytearray(len(data) // 3 * 4)
+        if bigEndian:
+            padded[0::4], padded[1::4], padded[2::4] = data[0::3], data[1::3], data[2::3]
+        else:
+            padded[1::4], padded[2::4], padded[3::4] = data[0::3], data[1::3], data[2::3]
+        samples = array('i', bytes(padded))
+    else:
+        samples = array('i', data)
+    if bigEndian and width != 1:
+        samples.byteswap() # Python arrays use native (little-endian) order
+    return samples
+
+def ReadEnvelope(path, fps):
+    audio, bigEndian = OpenAudio(path)
+    if audio is None: # Unsupported format
+        return None
+    try:
+        rate = audio.getframerate() # Audio frames per second
+        width = audio.getsampwidth() # Bytes per sample
+        scale = 1.0 / (1 << (8 * (4 if width == 3 else width) - 1)) # Full scale to -1..1, 24-bit is padded to 32-bit
+        channels = audio.getnchannels()
+        total = audio.getnframes()
+        frames = int(math.ceil(total * float(fps) / rate)) # Document frames
+        envelope = array('f') # Min, max and RMS for every document frame
+        pending = DecodeSamples(b'', width, bigEndian) # Samples not assigned to a frame yet
+        start = 0 # First audio frame of the current document frame
+        for frame in range(frames):
+            end = min(total, int(round((frame + 1) * rate / float(fps)))) # Last audio frame of the document frame
+            while len(pending) < (end - start) * channels: # Stream the file in chunks
+                data = audio.readframes(CHUNK_FRAMES)
+                if len(data) == 0:
+                    break
+                pending.extend(DecodeSamples(data, width, bigEndian))
+            count = (end - start) * channels
+            samples = pending[:count]
+            del pending[:count]
+            start = end
+            if len(samples) == 0:
+                envelope.extend((0.0, 0.0, 0.0))
+            else:
+                envelope.extend((min(samples) * scale, max(samples) * scale,
+                                 math.sqrt(sum(x * x for x in samples) / len(samples)) * scale))
+        return envelope
+    finally:
+        audio.close()
+
+def StoreEnvelope(obj, envelope, fps):
+    packed = array('h', [int(round(max(-1.0, min(1.0, v)) * 32767)) for v in envelope]) # 16-bit min, max, RMS
+    bc = c4d.GetCustomDatatypeDefault(c4d.DTYPE_STRING) # Initialize user data
+    bc[c4d.DESC_NAME] = "Envelope" # Set user data name
+    bc[c4d.DESC_SHORT_NAME] = "Envelope" # Set userdata short name
+    bc[c4d.DESC_ANIMATE] = c4d.DESC_ANIMATE_OFF # Disable animation option
+    bc[c4d.DESC_EDITABLE] = False # Read only
+    element = obj.AddUserData(bc) # Add user data
+    obj[element] = "%s;%s" % (fps, base64.b64encode(packed.tobytes()).decode('ascii')) # FPS and packed envelope
+    return element
+
+def CreateUserDataFloat(obj, name):
+    bc = c4d.GetCustomDatatypeDefault(c4d.DTYPE_REAL) # Initialize user data
+    bc[c4d.DESC_NAME] = name # Set user data name
+    bc[c4d.DESC_SHORT_NAME] = name # Set userdata short name
+    bc[c4d.DESC_UNIT] = c4d.DESC_UNIT_FLOAT
+    bc[c4d.DESC_MIN] = -1.0
+    bc[c4d.DESC_MAX] = 1.0
+    bc[c4d.DESC_STEP] = 0.01
+    return obj.AddUserData(bc) # Add user data
+
+def KeyEnvelope(obj, envelope, startFrame, fps):
+    for i, name in enumerate(["Min", "Max", "RMS"]): # One channel for every value
+        element = CreateUserDataFloat(obj, name)
+        track = c4d.CTrack(obj, element) # Initialize CTrack
+        obj.InsertTrackSorted(track) # Insert CTrack to the object
+        curve = track.GetCurve() # Get Curve of the CTrack
+        for frame in range(len(envelope) // 3): # All keys in one go
+            key = curve.AddKey(c4d.BaseTime(startFrame + frame, fps))["key"]
+            key.SetValue(curve, envelope[frame * 3 + i])
+            key.SetInterpolation(curve, c4d.CINTERPOLATION_LINEAR)
 
 def main():
+    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
+    keyMod = GetKeyMod() # Get keymodifier
 
-    doc.StartUndo() # Start recording undos
-    
     path = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING, "Sound file", c4d.FILESELECT_LOAD)
+    if path is None: return # If no file, exit
     folderPath, fileName = os.path.split(path)
 
-    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document    
+    doc.StartUndo() # Start recording undos
     time = c4d.BaseTime(doc.GetTime().Get()) # Get current time
-    
+    fps = doc.GetFps() # Get frame rate
+
     null = c4d.BaseObject(c4d.Onull) # Initialize a null
     null.SetName("Sound: "+fileName) # Set name
     null[c4d.NULLOBJECT_DISPLAY] = 14 # Set 'Display' to 'None'
@@ -34,17 +171,26 @@ def main():
     null[c4d.ID_BASEOBJECT_USECOLOR] = 2 # Set 'Display Color' to 'On'
     null[c4d.ID_BASEOBJECT_COLOR] = c4d.Vector(140.0/255.0, 203.0/255.0, 1.0)
     null[c4d.ID_BASELIST_ICON_COLOR] = c4d.Vector(140.0/255.0, 203.0/255.0, 1.0)
-    doc.InsertObject(null) # Insert null to the document   
-    doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, null) # Add undo
     desc = c4d.DescID(c4d.DescLevel(c4d.CTsound, c4d.CTsound, 0))
     SoundTrack = c4d.CTrack(null, desc) # Initialize a sound Track
     null.InsertTrackSorted(SoundTrack) # Insert the sound track to the object
     SoundTrack[c4d.CID_SOUND_NAME] = path # Set sound  file path
     SoundTrack[c4d.CID_SOUND_START] = time # Set time
 
+    try: # Waveform envelope, decoded only once
+        envelope = ReadEnvelope(path, fps)
+    except Exception: # Broken or unsupported audio file, sound track is still created
+        envelope = None
+    if envelope is not None:
+        StoreEnvelope(null, envelope, fps)
+        if keyMod == "Shift":
+            KeyEnvelope(null, envelope, time.GetFrame(fps), fps)
+
+    doc.InsertObject(null) # Insert null to the document
+    doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, null) # Add undo
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Update Cinema 4D
 
 # Execute main()
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
@@ -4,30 +4,226 @@ AR_ImportfSpy
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_ImportfSpy
-Version: 1.0.0
-Description-US: Creates a camera from fSpy JSON-file and Background object from Image-file
+Version: 1.1.2
+Description-US: Creates a camera from fSpy JSON-file and Background object from Image-file. Shift: Imports every fSpy solve from a folder
 
 To Do:
     > Try to import background image automatically
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
+
+Change log:
+1.1.2 (19.10.2026) - fspy project and its exported JSON-file with the same name create only one camera, JSON-file is preferred
+1.1.1 (19.10.2026) - Unrelated or broken JSON-files are skipped, images embedded in fspy projects are saved only after asking
+1.1.0 (19.10.2026) - Shift: Imports every fSpy solve (JSON or fspy project) from a folder, files are parsed in parallel and same images share one material
 """
 
 # Libraries
 import c4d
 import json
 import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from c4d import storage as s
 from c4d import utils as u
 
 # Global variables
 scale = 100.0 # Set scale
+imageFormats = ["jpg", "jpeg", "png", "tif", "tiff", "exr", "tga", "psd"] # Background image formats
 
 # Functions
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
+def CameraMatrix(rows):
+    mat = c4d.Matrix() # Initialize a matrix, fSpy's columns with y and z swapped
+    mat.off = c4d.Vector(rows[0][3], rows[2][3], rows[1][3])
+    mat.v1 = c4d.Vector(rows[0][0], rows[2][0], rows[1][0])
+    mat.v2 = c4d.Vector(rows[0][1], rows[2][1], rows[1][1])
+    mat.v3 = c4d.Vector(rows[0][2], rows[2][2], rows[1][2])
+    Z = u.MatrixScale(c4d.Vector(1, 1, -1)) # Initialize a scaling matrix
+    mat = mat * Z # Flip Z
+
+    # Y-axis up
+    R = u.MatrixRotX(u.DegToRad(90))
+    mat = R * mat
+    mat.off = mat.off * scale
+    return mat
+
+def ReadSolve(path, images):
+    name = os.path.basename(path).rpartition(".")[0] # Get name from file path
+    image = images.get(name) # Image with the same name
+    embedded = None # Position, size and extension of the image inside a fSpy project
+    try:
+        if path.lower().endswith(".fspy"): # fSpy project file: header, state JSON and the image
+            with open(path, 'rb') as f:
+                magic, version, stateSize, imageSize = struct.unpack('<4sIII', f.read(16))
+                if magic != b'fspy':
+                    return None
+                data = json.loads(f.read(stateSize).decode('utf-8'))['cameraParameters']
+                if data is None: # Not solved
+                    return None
+                if image is None and imageSize > 0: # Image is only in the project
+                    start = f.read(4)
+                    extension = ".png" if start == b'\x89PNG' else ".jpg" if start[:2] == b'\xff\xd8' else None
+                    if extension is not None:
+                        embedded = (16 + stateSize, imageSize, extension)
+        else: # Exported JSON-file
+            with open(path) as json_file:
+                data = json.load(json_file)
+        return {'name': name,
+                'path': path,
+                'rows': data['cameraTransform']['rows'],
+                'fov': float(data['horizontalFieldOfView']),
+                'width': data.get('imageWidth'),
+                'height': data.get('imageHeight'),
+                'image': image,
+                'embedded': embedded}
+    except (KeyError, TypeError, ValueError, OSError, struct.error): # Not a fSpy file or broken file
+        return None
+
+def ExtractImage(solve):
+    offset, size, extension = solve['embedded']
+    image = os.path.join(os.path.dirname(solve['path']), solve['name'] + extension)
+    with open(solve['path'], 'rb') as f: # Copy the image out of the fSpy project
+        f.seek(offset)
+        buffer = f.read(size)
+    with open(image, 'wb') as imageFile:
+        imageFile.write(buffer)
+    return image
+
+def ReadSolves(folder):
+    solves = {} # File name without extension: solve file path
+    images = {} # File name without extension: image path
+    for f in sorted(os.listdir(folder)): # Loop through files
+        path = os.path.join(folder, f)
+        name, dot, extension = f.rpartition(".")
+        extension = extension.lower()
+        if extension == "json": # Exported JSON-file wins over the project with the same name
+            solves[name] = path
+        elif extension == "fspy":
+            solves.setdefault(name, path)
+        elif extension in imageFormats:
+            images.setdefault(name, path)
+    solves = [solves[name] for name in sorted(solves)]
+    with ThreadPoolExecutor(max_workers=8) as pool: # Read and parse files in parallel
+        results = list(pool.map(lambda path: ReadSolve(path, images), solves))
+    return [r for r in results if r is not None]
+
+def CollectImageMaterials(doc):
+    cache = {} # Image path: material
+    for m in doc.GetMaterials(): # Reuse materials that are already in the document
+        if m.GetType() == c4d.Mmaterial:
+            shader = m[c4d.MATERIAL_COLOR_SHADER]
+            if shader is not None and shader.GetType() == c4d.Xbitmap:
+                cache.setdefault(os.path.normcase(shader[c4d.BITMAPSHADER_FILENAME]), m)
+    return cache
+
+def CreateImageMaterial(fn):
+    mat = c4d.BaseMaterial(c4d.Mmaterial) # Initialize a material
+    mat[c4d.MATERIAL_USE_REFLECTION] = 0 # Disable reflection channel
+    color = c4d.BaseShader(c4d.Xbitmap) # Color channel
+    color[c4d.BITMAPSHADER_FILENAME] = fn
+    luminance = color.GetClone() # Luminance channel
+    mat[c4d.MATERIAL_COLOR_SHADER] = color
+    mat[c4d.MATERIAL_LUMINANCE_SHADER] = luminance
+    mat.InsertShader(color) # Insert shader to color channel
+    mat.InsertShader(luminance) # Insert shader to luminance channel
+    mat.Message(c4d.MSG_UPDATE)
+    mat.Update(True, True) # Update material
+    mat.SetName(os.path.basename(fn).rpartition(".")[0]) # Set material name
+    return mat
+
+def ImportFolder(doc, folder):
+    solves = ReadSolves(folder) # Parsed on a thread pool
+    if len(solves) == 0:
+        return 0
+    embedded = [solve for solve in solves if solve['embedded'] is not None]
+    if len(embedded) != 0: # Ask before writing files to the folder
+        if c4d.gui.QuestionDialog("Save %s background image(s) from fSpy project files to the folder?" % len(embedded)):
+            for solve in embedded:
+                try:
+                    solve['image'] = ExtractImage(solve)
+                except OSError: # Folder is not writable
+                    pass
+    materials = CollectImageMaterials(doc) # Image path: material
+    doc.StartUndo() # Start recording undos
+    null = c4d.BaseObject(c4d.Onull) # Initialize a null object for the cameras
+    null.SetName("fSpy")
+    for i, solve in enumerate(solves): # Build everything on the main thread
+        cam = c4d.BaseObject(c4d.Ocamera) # Initialize a camera object
+        cam.SetName("cam_"+solve['name']) # Set camera name
+        cam[c4d.CAMERAOBJECT_FOV] = solve['fov'] # Set field of view
+        cam[c4d.CAMERAOBJECT_TARGETDISTANCE] = 20 * scale # Set focus distance
+        cam.InsertUnderLast(null)
+        cam.SetMg(CameraMatrix(solve['rows'])) # Set matrix
+        if solve['image'] is not None:
+            key = os.path.normcase(solve['image'])
+            mat = materials.get(key)
+            if mat is None: # Same image gets only one material
+                mat = CreateImageMaterial(solve['image'])
+                doc.InsertMaterial(mat) # Insert new material to document
+                doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
+                materials[key] = mat
+            bgObject = c4d.BaseObject(5122) # Initialize a background object
+            bgObject.SetName("bg_"+solve['name'])
+            if i != 0: # Only the first background is visible
+                bgObject[c4d.ID_BASEOBJECT_VISIBILITY_EDITOR] = 1 # Off
+                bgObject[c4d.ID_BASEOBJECT_VISIBILITY_RENDER] = 1 # Off
+            tag = c4d.BaseTag(5616) # Initialize texture tag
+            tag[c4d.TEXTURETAG_MATERIAL] = mat # Set material to texture tag
+            tag[c4d.TEXTURETAG_PROJECTION] = 4 # Set texture projection to Frontal
+            bgObject.InsertTag(tag) # Insert texture tag to object
+            bgObject.InsertUnder(cam)
+    doc.InsertObject(null) # Insert cameras to the document
+    doc.AddUndo(c4d.UNDOTYPE_NEW, null) # Record undo step
+
+    first = solves[0]
+    if first['width'] and first['height']: # Render settings from the first solve
+        renderData = doc.GetActiveRenderData() # Get document render data
+        doc.AddUndo(c4d.UNDOTYPE_CHANGE, renderData)
+        renderData[c4d.RDATA_XRES] = first['width']
+        renderData[c4d.RDATA_YRES] = first['height']
+        renderData[c4d.RDATA_FILMASPECT] = float(first['width']) / float(first['height'])
+    doc.GetActiveBaseDraw().SetSceneCamera(null.GetDown()) # Set active camera
+    doc.EndUndo() # End recording undos
+    return len(solves)
+
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
 
+    if GetKeyMod() == "Shift": # Batch import
+        folder = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select folder with fSpy files',c4d.FILESELECT_DIRECTORY,'')
+        if not folder: return
+        count = ImportFolder(doc, folder)
+        c4d.StatusSetText("Imported %s fSpy camera(s)" % count)
+        c4d.EventAdd() # Update Cinema 4D
+        return
+
     # Load fSpy data and create the camera object
 
     fn = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select fspy JSON-file')
@@ -36,40 +232,7 @@ def main():
     with open(fn) as json_file:
         data = json.load(json_file)
 
-    matrix_rows = [[0, 1, 2, 3],
-                   [0, 1, 2, 3],
-                   [0, 1, 2, 3],
-                   [0, 1, 2, 3]]
-
-    for i, matrix_list in enumerate(data['cameraTransform']['rows']):
-        for k in range(0,4):
-            matrix_rows[i][k] = matrix_list[k]
-
-    a0 = []
-    a1 = []
-    a2 = []
-    a3 = []
-
-    for i, x in enumerate(matrix_rows):
-        a0.append(x[0])
-        a1.append(x[1])
-        a2.append(x[2])
-        a3.append(x[3])
-
-    mat = c4d.Matrix() # Initialize a matrix
-    mat.off = c4d.Vector(a3[0], a3[2], a3[1])
-    mat.v1 = c4d.Vector(a0[0], a0[2], a0[1])
-    mat.v2 = c4d.Vector(a1[0], a1[2], a1[1])
-    mat.v3 = c4d.Vector(a2[0], a2[2], a2[1])
-    Z = u.MatrixScale(c4d.Vector(1, 1, -1)) # Initialize a scaling matrix
-    mat = mat * Z # Flip Z
-
-    # Y-axis up
-    glMat = c4d.Matrix()
-    R = u.MatrixRotX(u.DegToRad(90))
-    glMat = glMat * R
-    mat = glMat * mat
-    mat.off = mat.off * scale
+    mat = CameraMatrix(data['cameraTransform']['rows']) # Convert fSpy's matrix
 
     doc.StartUndo() # Start recording undos
 
@@ -93,32 +256,12 @@ def main():
     fn = s.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select background image')
     if fn != None:
         
-        mat = c4d.BaseMaterial(c4d.Mmaterial) # Initialize a material
-        mat[c4d.MATERIAL_USE_REFLECTION] = 0 # Disable reflection channel
-        
-        # Color channel
-        color = c4d.BaseShader(c4d.Xbitmap)
-        color[c4d.BITMAPSHADER_FILENAME] = fn
-        mat[c4d.MATERIAL_COLOR_SHADER] = color
-
-        # Luminance channel
-        luminance = c4d.BaseShader(c4d.Xbitmap)
-        luminance[c4d.BITMAPSHADER_FILENAME] = fn
-        mat[c4d.MATERIAL_LUMINANCE_SHADER] = luminance
-
-        # Assign shaders to material
-        mat.InsertShader(color) # Insert shader to color channel
-        mat.InsertShader(luminance) # Insert shader to luminance channel
-
-        # Other stuff
-        mat.Message(c4d.MSG_UPDATE)
-        mat.Update(True, True) # Update material
-
-        f = os.path.basename(fn)
-        name = f.rpartition(".")[0] # Get name from file path
-        mat.SetName(name) # Set material name
-        doc.InsertMaterial(mat) # Insert new material to document
-        doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
+        mat = CollectImageMaterials(doc).get(os.path.normcase(fn)) # Reuse material with the same image
+        if mat is None:
+            mat = CreateImageMaterial(fn)
+            doc.InsertMaterial(mat) # Insert new material to document
+            doc.AddUndo(c4d.UNDOTYPE_NEW, mat) # Add undo command for inserting new material
+        color = mat[c4d.MATERIAL_COLOR_SHADER]
 
         # Get bitmap size
         irs = c4d.modules.render.InitRenderStruct() # Needed to get shader's bitmap info
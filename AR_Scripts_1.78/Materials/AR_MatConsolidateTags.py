@@ -4,13 +4,16 @@ AR_MatConsolidateTags
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_MatConsolidateTags
-Version: 1.0.1
+Version: 1.1.0
 Description-US: Consolidates different polygon selections together that uses same materials. Messes up material projections! Select object(s) and run the script.
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.0 (19.10.2026) - Material tags are grouped by material and selection tags are looked up by name.
+                     Merged selections are built from a polygon mask and only one undo is recorded per object.
+                     Selection tags that are not used by material tags are kept.
 1.0.1 (24.03.2022) - Updated for R25
 """
 
@@ -35,45 +38,69 @@ def IterateHierarchy(op):
         op = GetNextObject(op)
     return
 
+def SelectionMask(selects, count):
+    mask = [False] * count # Initialize boolean mask over polygon indices
+    for bs in selects: # Iterate through selections
+        for seg in range(bs.GetSegments()): # Iterate through selected ranges
+            a, b = bs.GetRange(seg, count)
+            mask[a:b+1] = [True] * (b - a + 1) # Mark the whole range at once
+    return mask
+
 def ConsolidateMaterialSelections(s):
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
-    selectionTags = [] # Initialize list for selection tags
-    materialTags = [] # Initialize list for material tags
-    materials = [] # Initialize list for materials
+    if not isinstance(s, c4d.PolygonObject): # Selection tags live only on polygon objects
+        return
+    polyCount = s.GetPolygonCount() # Get polygon count
+    selectionTags = {} # Initialize dictionary for selection tags, name: tag
+    groups = {} # Initialize dictionary for material tags, material: [tags]
     tags = s.GetTags() # Get object's tags
 
     # Collect information
     for t in tags: # Iterate through tags
-        #print t.GetType(), t.GetName()
         if t.GetType() == 5673: # If tag is a selection tag
-            selectionTags.append(t) # Add tag to selection tags list
+            selectionTags.setdefault(t.GetName(), t) # First tag with the name wins, like in C4D
         elif t.GetType() == 5616: # If tag is a material tag
-            materialTags.append(t) # Add tag to material tags list
-            if t[c4d.TEXTURETAG_MATERIAL] not in materials: # If material is not already in materials
-                materials.append(t[c4d.TEXTURETAG_MATERIAL]) # Add material to materials list
-        else: # Otherwise
-            pass # Do nothing
+            m = t[c4d.TEXTURETAG_MATERIAL]
+            if m is not None:
+                groups.setdefault(m, []).append(t) # Group material tags by material
+
+    if len(groups) == 0: # Nothing to consolidate
+        return
+
+    doc.AddUndo(c4d.UNDOTYPE_CHANGE, s) # One undo for the whole object
 
     # Action
-    for m in materials: # Iterate through materials
-        materialTag = c4d.BaseTag(5616) # Initialize a material tag
+    usedSelections = {} # Selection tags that were consolidated
+    for m, materialTags in groups.items(): # Iterate through materials
+        selects = [] # Collect selections used by the material
+        wholeObject = False
+        for mt in materialTags: # Iterate through material tags
+            restriction = mt[c4d.TEXTURETAG_RESTRICTION]
+            st = selectionTags.get(restriction)
+            if st is None: # No restriction, material covers every polygon
+                wholeObject = True
+                continue
+            selects.append(st.GetBaseSelect())
+            usedSelections[restriction] = st
+        if wholeObject:
+            mask = [True] * polyCount
+        else:
+            mask = SelectionMask(selects, polyCount) # Build merged selection from mask
+
         selectionTag = c4d.SelectionTag(c4d.Tpolygonselection) # Initialize a selection tag
         selectionTag.SetName(m.GetName()+"_sel") # Set selection tag's name
-        for mt in materialTags: # Iterate through material tags
-            doc.AddUndo(c4d.UNDOTYPE_DELETE, s) # Add undo for deleting tags
-            if mt[c4d.TEXTURETAG_MATERIAL] == m: # If material tag uses material
-                for st in selectionTags: # Iterate through selection tags
-                    if mt[c4d.TEXTURETAG_RESTRICTION] == st.GetName(): # If material tag is using this selection tag
-                        fromSelect = st.GetBaseSelect() # Get old selection
-                        toSelect = selectionTag.GetBaseSelect() # Get selection
-                        toSelect.Merge(fromSelect) # Add to selection
-                    st.Remove() # Remove old selection tag
-                mt.Remove() # Remove old material tag
-        s.InsertTag(selectionTag) # Insert selection tag to the object
-        s.InsertTag(materialTag) # Insert new material tag
-        doc.AddUndo(c4d.UNDOTYPE_NEW, s) # Add undo for new tags
+        selectionTag.GetBaseSelect().SetAll(mask) # Set merged selection
+        materialTag = c4d.BaseTag(5616) # Initialize a material tag
         materialTag[c4d.TEXTURETAG_MATERIAL] = m # Set material
         materialTag[c4d.TEXTURETAG_RESTRICTION] = selectionTag.GetName() # Set selection
+        for mt in materialTags: # Remove old material tags
+            mt.Remove()
+        s.InsertTag(selectionTag, s.GetLastTag()) # Insert selection tag to the object
+        s.InsertTag(materialTag, s.GetLastTag()) # Insert new material tag
+
+    for st in usedSelections.values(): # Remove old selection tags
+        if st.GetObject() is not None:
+            st.Remove()
 
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
@@ -4,22 +4,33 @@ AR_MatMerge
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_MatMerge
-Version: 1.0.0
-Description-US: Merges materials with the same name.
+Version: 1.1.1
+Description-US: Merges materials with the same name. Shift: Merges materials with identical content, even if names are different.
 
 Written for Maxon Cinema 4D R25.117
 Python version 3.9.1
 
 Change log:
+1.1.1 (19.10.2026) - Shift: Linked shaders are compared where they are linked. Materials with parameters that can't be compared are never merged
+1.1.0 (19.10.2026) - Material names are normalized once with precompiled regex and texture tags are reassigned with one lookup.
+                     Shift: Merges materials that have identical content (shaders and settings) regardless of the name.
 1.0.0 (14.04.2022) - Initial version
 """
 
 # Libraries
 import c4d, re
+import hashlib
+try:
+    import redshift
+except:
+    pass
+
+# Global variables
+nameSuffix = re.compile(r"\.\d+$") # Cinema 4D's duplicate name suffix, e.g. 'Mat.1'
 
 # Classes
 class matObject:
-    matList = []    
+    matList = []
     def __init__(self, name):
         self.name = name
         self.mats = []
@@ -28,6 +39,32 @@ class matObject:
         self.mats.append(newMat)
 
 # Functions
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
 def GetNextObject(op):
     if op == None:
         return None
@@ -40,7 +77,7 @@ def GetNextObject(op):
 def CollectTextureTags(op):
     tTags = []
     if op is None:
-        return
+        return tTags
     while op:
         tags = op.GetTags()
         for t in tags:
@@ -49,28 +86,98 @@ def CollectTextureTags(op):
         op = GetNextObject(op)
     return tTags
 
+def NormalizeName(name):
+    return nameSuffix.sub("", name) # Strip duplicate suffix
+
+def HashValue(h, value):
+    if isinstance(value, c4d.BaseContainer): # Sub container
+        HashContainer(h, value)
+    elif isinstance(value, c4d.BaseShader): # Linked shader, hashed by content where it is linked
+        HashShader(h, value)
+    elif isinstance(value, c4d.BaseList2D): # Linked object, tag etc.
+        h.update(str(value.GetType()).encode())
+        h.update(value.GetName().encode())
+    elif value is None or isinstance(value, (bool, int, float, str, c4d.Vector, c4d.Matrix)): # Plain values
+        h.update(repr(value).encode())
+    elif isinstance(value, c4d.BaseTime):
+        h.update(repr(value.Get()).encode())
+    else: # Custom data (gradient, spline etc.) can't be compared reliably
+        raise TypeError("Unhashable parameter")
+
+def HashContainer(h, bc):
+    for cid, value in bc: # Iterate through container
+        if cid == c4d.ID_BASELIST_NAME: # Name doesn't count as content
+            continue
+        h.update(str(cid).encode())
+        HashValue(h, value)
+
+def HashShader(h, sh):
+    h.update(str(sh.GetType()).encode())
+    HashContainer(h, sh.GetDataInstance()) # Shader settings and its linked shaders
+    child = sh.GetDown()
+    while child: # Child shaders, e.g. layers
+        HashShader(h, child)
+        child = child.GetNext()
+
+def HashNodes(h, node):
+    while node: # Iterate through node graph
+        h.update(str(node.GetOperatorID()).encode())
+        HashContainer(h, node.GetOperatorContainer())
+        for port in node.GetOutPorts(): # Hash connections
+            for destination in port.GetDestination():
+                h.update(str(port.GetMainID()).encode())
+                h.update(destination.GetNode().GetName().encode())
+                h.update(str(destination.GetMainID()).encode())
+        HashNodes(h, node.GetDown())
+        node = node.GetNext()
+
+def ContentHash(mat):
+    h = hashlib.sha1()
+    try:
+        h.update(str(mat.GetType()).encode())
+        HashContainer(h, mat.GetDataInstance()) # Material settings, shaders are hashed where they are linked
+        nodeMaster = None
+        try: # Redshift node graph
+            nodeMaster = redshift.GetRSMaterialNodeMaster(mat)
+        except:
+            pass
+        if nodeMaster is not None:
+            HashNodes(h, nodeMaster.GetRoot().GetDown())
+    except Exception: # Something that can't be hashed, never merge this material
+        return "unique_%s" % id(mat)
+    return h.hexdigest()
+
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
     doc.StartUndo() # Start recording undos
+    keyMod = GetKeyMod() # Get keymodifier
     materials = doc.GetMaterials() # Get materials
-    
+
+    if keyMod == "Shift": # Merge materials with identical content
+        KeyFunction = ContentHash
+    else: # Merge materials with the same name
+        KeyFunction = lambda m: NormalizeName(m.GetName())
+
     # Collect materials
-    matObjs = {}
+    matObjs = {} # Key: matObject
+    canonical = {} # Material: material that will be kept
     for i, m in enumerate(materials): # Iterate through materials
-        name = re.split("\\.\\d$", m.GetName())[0] # Get name of the material
-        if name not in matObjs: # If material name not already in matObjs list
-            matObjs[name] = matObject(name) # Create a new material
-        matObjs[name].addMat(m) # Add material to the material object
-    
+        key = KeyFunction(m) # Get key of the material
+        if key not in matObjs: # If key not already in matObjs
+            matObjs[key] = matObject(key) # Create a new material
+        matObjs[key].addMat(m) # Add material to the material object
+        canonical[m] = matObjs[key].mats[0]
+
     # Assign new materials
-    tTags = CollectTextureTags(doc.GetFirstObject()) # Collect all texture tags 
+    tTags = CollectTextureTags(doc.GetFirstObject()) # Collect all texture tags
     for t in tTags: # Iterate through texture tags
         mat = t[c4d.TEXTURETAG_MATERIAL] # Get material of the texture tag
-        for m in matObjs: # Iterate through material objects
-            if matObjs[m].name == re.split("\\.\\d$", mat.GetName())[0]:
-                doc.AddUndo(c4d.UNDOTYPE_CHANGE, t) # Record undo
-                t[c4d.TEXTURETAG_MATERIAL] = matObjs[m].mats[0] # Set new material
-        
+        if mat is None: continue
+        newMat = canonical.get(mat) # Look up the material that will be kept
+        if newMat is not None and newMat != mat:
+            doc.AddUndo(c4d.UNDOTYPE_CHANGE, t) # Record undo
+            t[c4d.TEXTURETAG_MATERIAL] = newMat # Set new material
+
     # Deleting materials
     for m in matObjs: # Iterate through material objects
         cnt = len(matObjs[m].mats) # Get count of materials
@@ -84,4 +191,4 @@ def main():
 
 # Execute main()
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
@@ -4,13 +4,14 @@ AR_MatOverride
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_MatOverride
-Version: 1.0.0
+Version: 1.0.1
 Description-US: Overrides selected materials with the top of the list selected material
 
 Written for Maxon Cinema 4D 2023.1.3
 Python version 3.9.1
 
 Change log:
+1.0.1 (19.10.2026) - Material tags are collected in one pass, instead of walking the document once per selected material
 1.0.0 (28.03.2023) - Initial realease
 """
 
@@ -27,16 +28,15 @@ def GetNextObject(op):
         op = op.GetUp()
     return op.GetNext()
 
-def CollectMaterialTags(op, material):
-    materialTags = []
-    if op is None:
-        return
+def CollectMaterialTags(op):
+    materialTags = {} # Initialize dictionary, material: [material tags]
     while op:
         tags = op.GetTags()
         for t in tags:
             if t.GetType() == 5616: # Material tag
-                if t[c4d.TEXTURETAG_MATERIAL] == material:
-                    materialTags.append(t)
+                material = t[c4d.TEXTURETAG_MATERIAL]
+                if material is not None:
+                    materialTags.setdefault(material, []).append(t)
         op = GetNextObject(op)
     return materialTags
 
@@ -44,17 +44,21 @@ def main():
     doc.StartUndo()
     materials = doc.GetMaterials()
     selected = []
-    
+
     # Collect materials
     for m in materials:
         if m.GetBit(c4d.BIT_ACTIVE) == True:
             selected.append(m)
-    
+
+    if len(selected) == 0: # If no selected materials
+        doc.EndUndo()
+        return
+
     # Get texture tags
-    startObj = doc.GetFirstObject()
+    index = CollectMaterialTags(doc.GetFirstObject()) # Walk the document only once
     MaterialTags = []
     for s in selected:
-        MaterialTags.extend(CollectMaterialTags(startObj, s))
+        MaterialTags.extend(index.get(s, []))
 
     # Assign the first material to all material tags
     mat = selected[0]
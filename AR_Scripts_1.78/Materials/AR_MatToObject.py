@@ -4,13 +4,14 @@ AR_MatToObject
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_MatToObject
-Version: 1.0.1
+Version: 1.1.0
 Description-US: Puts material(s) to object(s) with same name
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.0 (19.10.2026) - Objects are collected by name in one pass, instead of walking the object tree once per material
 1.0.1 (24.03.2022) - Updated for R25
 """
 
@@ -35,30 +36,28 @@ def InsertMaterialTag(op, m):
     op.InsertTag(tag) # Insert tag to the object
     doc.AddUndo(c4d.UNDOTYPE_NEW, tag) # Record undo for adding tag
 
-def MatsToObjsWithSameName(op, m, selection, doc):
-    if op is None:
-        return
-    while op:
-        if selection:
-            if op.GetName() == m.GetName(): # If there are object
-                if op.GetBit(c4d.BIT_ACTIVE): # If object is selected
-                    InsertMaterialTag(op, m) # Insert material tag to selected object
-        else:
-            if op.GetName() == m.GetName(): # If there are object
-                InsertMaterialTag(op, m) # Insert material tag to the object
+def BuildNameIndex(op, selected):
+    index = {} # Initialize dictionary, object name: [objects]
+    while op: # Walk the whole object tree once
+        if not selected or op.GetBit(c4d.BIT_ACTIVE): # If there are selected objects, use only those
+            index.setdefault(op.GetName(), []).append(op)
         op = GetNextObject(op)
-    return True
+    return index
+
+def MatsToObjsWithSameName(materials, index):
+    for m in materials: # Iterate through materials
+        for op in index.get(m.GetName(), []): # Objects with the same name
+            InsertMaterialTag(op, m) # Insert material tag to the object
 
 def main():
     doc.StartUndo() # Start recording undos
     selection = doc.GetActiveObjects(0) # Get active objects
     materials = doc.GetMaterials() # Get all materials
-    startObject = doc.GetFirstObject() # Get the first object of the document
-    for m in materials: # Iterate through materials
-        MatsToObjsWithSameName(startObject, m, selection, doc) # Run the main function            
+    index = BuildNameIndex(doc.GetFirstObject(), len(selection) != 0) # Collect objects by name
+    MatsToObjsWithSameName(materials, index) # Run the main function
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
-        
+
 # Execute main()
 if __name__=='__main__':
     main()
\ No newline at end of file
@@ -4,7 +4,7 @@ AR_MoSelectionMerge
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_MoSelectionMerge
-Version: 1.0.1
+Version: 1.1.0
 Description-US: Merges selected MoGraph Selection Tag into one tag
 Note: If you have nested MoGraph Generator, disable parent generators before running this script
 
@@ -15,6 +15,7 @@ To Do:
 - Option to keep old tags
 
 Change log:
+1.1.0 (19.10.2026) - Tags are indexed by object in one pass and merged with one combined range operation
 1.0.1 (29.03.2022) - Support for R25
 """
 
@@ -23,44 +24,55 @@ import c4d
 from c4d.modules import mograph as mo
 
 # Functions
-def SortTags(items):
-    msTags = [] # Init list for polygon selection tags
-    objects = [] # Init list for objects
+def SortTags(items, index=None):
+    if index is None:
+        index = {} # Init dictionary for tags, object GUID: [tags]
 
     # Sort
     for t in items:
         if t.GetType() == 1021338: # MoGraph selection tag
-            msTags.append(t)
-            objects.append(t.GetObject().GetGUID())
+            obj = t.GetObject()
+            if obj is None:
+                continue
+            index.setdefault(obj.GetGUID(), []).append(t)
+    return index
 
-    objects = list(dict.fromkeys(objects)) # Remove duplicates
-    return msTags, objects
+def MergeRanges(selects):
+    ranges = [] # Init list for selected ranges
+    for bs in selects:
+        for seg in range(bs.GetSegments()):
+            ranges.append(bs.GetRange(seg, c4d.MAXLONGl))
+    ranges.sort()
 
-def MergeMoGraphSelectionTags(msTags, objects):
-    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document    
-    nameSet = False # If name is not set
-    for o in objects:
-        collectedMsTags = []
-        for t in msTags:
-            k = t.GetObject()
-            if k != None:
-                if k.GetGUID() == o:
-                    collectedMsTags.append(t)
+    merged = c4d.BaseSelect() # Initialize a base select
+    current = None
+    for a, b in ranges: # Coalesce overlapping and adjacent ranges
+        if current is not None and a <= current[1] + 1:
+            current[1] = max(current[1], b)
+            continue
+        if current is not None:
+            merged.SelectAll(current[1], current[0])
+        current = [a, b]
+    if current is not None:
+        merged.SelectAll(current[1], current[0])
+    return merged
 
-        if len(collectedMsTags) >= 2:
-            mgSelTag = c4d.BaseTag(1021338) # Initialize MoGraph selection tag
-            selection = c4d.BaseSelect() # Initialize a base select
-            nameSet = False # If name is not set
-            for i in collectedMsTags: # Iterate through tags
-                if not nameSet: # If name is not set
-                    mgSelTag.SetName(i.GetName()) # Set name
-                    nameSet = True
-                selection.Merge(mo.GeGetMoDataSelection(i)) # Merge selections
-            i.GetObject().InsertTag(mgSelTag, i.GetObject().GetLastTag()) # Insert tag to object
-            doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, mgSelTag) # Record undo for inserting a new tag
-            mo.GeSetMoDataSelection(mgSelTag, selection) # Set MoGraph selection
-            mgSelTag.SetBit(c4d.BIT_ACTIVE) # Select tag
-    for r in msTags:
+def MergeMoGraphSelectionTags(index):
+    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
+    removeList = []
+    for collectedMsTags in index.values():
+        if len(collectedMsTags) < 2:
+            continue
+        obj = collectedMsTags[0].GetObject() # Get reference object
+        mgSelTag = c4d.BaseTag(1021338) # Initialize MoGraph selection tag
+        mgSelTag.SetName(collectedMsTags[0].GetName()) # Use the name of the first tag
+        selection = MergeRanges([mo.GeGetMoDataSelection(t) for t in collectedMsTags]) # Merge selections
+        obj.InsertTag(mgSelTag, obj.GetLastTag()) # Insert tag to object
+        doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, mgSelTag) # Record undo for inserting a new tag
+        mo.GeSetMoDataSelection(mgSelTag, selection) # Set MoGraph selection
+        mgSelTag.SetBit(c4d.BIT_ACTIVE) # Select tag
+        removeList.extend(collectedMsTags)
+    for r in removeList:
         doc.AddUndo(c4d.UNDOTYPE_DELETEOBJ, r) # Record undo for deleting a tag
         r.Remove() # Detele the tag
 
@@ -68,25 +80,20 @@ def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
     doc.StartUndo() # Start recording undos
     collectedObjects = [] # Collect objects
-    collectedTags = [] # Collect tags    
-    selection = doc.GetSelection() # Get selected items    
+    collectedTags = [] # Collect tags
+    selection = doc.GetSelection() # Get selected items
     for s in selection: # Iterate through selection
         if (type(s).__name__ == "BaseObject"):
             collectedObjects.append(s)
         elif s.GetType() == 1021338:
             collectedTags.append(s)
     if len(collectedTags) == 0: # If no tags selected
-        for i, obj in enumerate(collectedObjects):
-            collectedTags = []
-            tags = obj.GetTags()
-            for t in tags:
-                if t.GetType() == 1021338:
-                    collectedTags.append(t)
-            msTags, objects = SortTags(collectedTags)
-            MergeMoGraphSelectionTags(msTags, objects) #Run the merge function
+        index = {}
+        for obj in collectedObjects:
+            SortTags(obj.GetTags(), index)
     else: # If tags selected
-        msTags, objects = SortTags(selection)
-        MergeMoGraphSelectionTags(msTags, objects) #Run the merge function    
+        index = SortTags(collectedTags)
+    MergeMoGraphSelectionTags(index) # Run the merge function
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
 
@@ -4,7 +4,7 @@ AR_NodeAdd
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeAdd
-Version: 1.1.2
+Version: 1.1.3
 Description-US: Adds node between selected nodes (Only for Redshift).
 
 Notice: Make sure the Redshift material is selected when using the script!
@@ -13,6 +13,7 @@ Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.3 (19.10.2026) - Removed unused port functions
 1.1.2 (19.10.2023) - Update for Cinema 4D 2024
 1.1.1 (15.11.2022) - Fixed AOV port
 1.1.0 (06.05.2022) - Added Change Range node
@@ -147,18 +148,6 @@ class Dialog(GeDialog):
         return True # Everything is fine
 
 # Functions
-def GetPort(ports):
-    for i, port in enumerate(ports):
-        if port.GetNrOfConnections() == 0:
-            return port
-    return ports[0]
-
-def GetLastPort(ports):
-    for i, port in enumerate(reversed(ports)):
-        if port.GetNrOfConnections() == 0:
-            return port
-    return ports[-1]
-
 def CheckConnection(nodeA, nodeB):
     a = []
 
@@ -4,7 +4,7 @@ AR_NodeAlignV
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeAlignV
-Version: 1.0.3
+Version: 1.1.1
 Description-US: Aligns selected graph nodes vertically, supports Xpresso and Redshift
 
 Notice: Make sure the Xpresso tag or the Redshift material is selected when using the script!
@@ -13,6 +13,8 @@ Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.1 (19.10.2026) - Target graphs are collected up front from selected Xpresso tags and selected materials only
+1.1.0 (19.10.2026) - Node geometry is read in one pass to flat lists and only changed nodes are written back with one undo
 1.0.3 (19.10.2023) - Update for Cinema 4D 2024
 1.0.2 (07.10.2021) - Updated for R25
 1.0.1 (17.02.2021) - Alt modifier: The lowest node rules
@@ -20,20 +22,54 @@ Change log:
 
 # Libraries
 import c4d
-from operator import attrgetter
 try:
     import redshift
 except:
     pass
 
 # Classes
-class nodeObject(object):
-    def __init__(self, obj, px, py, sx, sy):
-        self.node = obj # Node object
-        self.px = px # X position
-        self.py = py # Y position
-        self.sx = sx # X scale
-        self.sy = sy # Y scale
+class NodeLayout(object):
+    def __init__(self, nodeMaster):
+        self.nodeMaster = nodeMaster # Node master
+        self.nodes = [] # Selected nodes
+        self.containers = [] # Operator container instances of the nodes
+        self.px = [] # X positions
+        self.py = [] # Y positions
+        self.sx = [] # X scales
+        self.sy = [] # Y scales
+        root = nodeMaster.GetRoot() # Get node master root
+        for node in root.GetChildren(): # Iterate through nodes, only once
+            if node.GetBit(c4d.BIT_ACTIVE): # If node is selected
+                bc  = node.GetDataInstance() # Get base container
+                bsc = bc.GetContainerInstance(c4d.ID_SHAPECONTAINER) # Get shape container
+                bcd = bsc.GetContainerInstance(c4d.ID_OPERATORCONTAINER) # Get operator container
+                self.nodes.append(node)
+                self.containers.append(bcd)
+                self.px.append(bcd.GetReal(100)) # Get x position
+                self.py.append(bcd.GetReal(101)) # Get y position
+                self.sx.append(bcd.GetReal(108)) # Get x scale
+                self.sy.append(bcd.GetReal(109)) # Get y scale
+        self.snapshot = (list(self.px), list(self.py), list(self.sx), list(self.sy)) # Original values
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def Order(self, values, reverse=False):
+        return sorted(range(len(values)), key=values.__getitem__, reverse=reverse) # Sorted node indices
+
+    def Apply(self):
+        changed = [i for i in range(len(self.nodes)) if (self.px[i], self.py[i], self.sx[i], self.sy[i]) !=
+                   (self.snapshot[0][i], self.snapshot[1][i], self.snapshot[2][i], self.snapshot[3][i])]
+        if not changed: # Nothing to write
+            return 0
+        self.nodeMaster.AddUndo() # Add undo for changing nodes, only once
+        for i in changed: # Write back only changed nodes
+            bcd = self.containers[i]
+            bcd.SetReal(100, self.px[i]) # Set x position
+            bcd.SetReal(101, self.py[i]) # Set y position
+            bcd.SetReal(108, self.sx[i]) # Set x scale
+            bcd.SetReal(109, self.sy[i]) # Set y scale
+        return len(changed)
 
 # Functions
 def GetKeyMod():
@@ -62,74 +98,50 @@ def GetKeyMod():
         return keyMod
 
 def AlignNodesVertically(nodeMaster, keyMod):
-    nodes = [] # Initialize a list for collecting nodes
-    root = nodeMaster.GetRoot() # Get xpresso root
-    for node in root.GetChildren(): # Iterate through nodes
-        if node.GetBit(c4d.BIT_ACTIVE): # If node is selected
-            bc = node.GetDataInstance() # Get copy of base container
-            bsc = bc.GetContainer(c4d.ID_SHAPECONTAINER) # Get copy of shape container
-            bcd = bsc.GetContainer(c4d.ID_OPERATORCONTAINER) # Get copy of operator container
-            px  = bcd.GetReal(100) # Get x position
-            py  = bcd.GetReal(101) # Get y position
-            sx  = bcd.GetReal(108) # Get x scale
-            sy  = bcd.GetReal(109) # Get y scale
-            nodes.append(nodeObject(node, px, py, sx, sy)) # Create nodeObject and add it to a list
-
-    if nodes:
-        if (keyMod == "Alt") or (keyMod == "Alt+Shift") or (keyMod == "Alt+Ctrl"):
-            theNode = max(nodes, key=attrgetter('py'))
-            nodes.sort(key=attrgetter('py')) # Sort nodes by the lowest y position
-            nodes.reverse()
-        else:
-            theNode = min(nodes, key=attrgetter('py'))
-            nodes.sort(key=attrgetter('py')) # Sort nodes by the highest y position
-
-    nodeMaster.AddUndo() # Add undo for changing nodes
-
-    for i in range(0, len(nodes)): # Iterate through collected nodes
-        node =  nodes[i].node # Get node
-        bc = node.GetDataInstance() # Get base container
-        bsc = bc.GetContainerInstance(c4d.ID_SHAPECONTAINER) # Get shape container
-        bcd = bsc.GetContainerInstance(c4d.ID_OPERATORCONTAINER) # Get operator container
-        p = theNode.px
-
+    layout = NodeLayout(nodeMaster) # Snapshot selected nodes
+    if len(layout) == 0: # If no selected nodes
+        return
+    if (keyMod == "Alt") or (keyMod == "Alt+Shift") or (keyMod == "Alt+Ctrl"):
+        t = layout.Order(layout.py, True)[0] # The lowest node rules
+    else:
+        t = layout.Order(layout.py)[0] # The highest node rules
+    tx = layout.px[t] # X position of the ruling node
+    ts = layout.sx[t] # X scale of the ruling node
+
+    for i in range(0, len(layout)): # Iterate through nodes
+        if i == t: # Ruling node stays in place
+            continue
         if (keyMod == "None") or (keyMod == "Alt"):
-            if i != 0:
-                tAnchor = nodes[i].sx / 2.0
-                sAnchor = (theNode.px + (theNode.sx / 2.0))
-                p = (sAnchor - tAnchor)
-
+            layout.px[i] = (tx + (ts / 2.0)) - (layout.sx[i] / 2.0) # Center
         elif (keyMod == "Ctrl") or (keyMod == "Alt+Ctrl"):
-            if i != 0:
-                tAnchor = nodes[i].sx
-                sAnchor = (theNode.px + theNode.sx)
-                p = (sAnchor - tAnchor)
-
-        elif (keyMod == "Shift") or (keyMod == "Alt+Shift"):
-            p = theNode.px
-
-        bcd.SetReal(100, p) # Set x position
+            layout.px[i] = (tx + ts) - layout.sx[i] # Right
+        else:
+            layout.px[i] = tx # Left
+
+    layout.Apply() # Write new positions
+
+def GetNodeMasters(doc):
+    nodeMasters = [] # Initialize a list for target graphs
+    for s in doc.GetSelection(): # Iterate through selection
+        if type(s).__name__ == "XPressoTag": # If operator is xpresso tag
+            nodeMasters.append(s.GetNodeMaster()) # Get node master
+    for m in doc.GetActiveMaterials(): # Iterate through selected materials only
+        try:
+            rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
+        except:
+            continue
+        if rsnm is not None:
+            nodeMasters.append(rsnm)
+    return nodeMasters
 
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active document
     bc = c4d.BaseContainer() # Initialize a base container
     keyMod = GetKeyMod() # Get keymodifier
     doc.StartUndo() # Start recording undos
-    materials = doc.GetMaterials() # Get materials
-    selection = doc.GetSelection() # Get active selection
-    try: # Try to execute following script
-        # Xpresso
-        for s in selection: # Iterate through selection
-            if type(s).__name__ == "XPressoTag": # If operator is xpresso tag
-                xpnm = s.GetNodeMaster() # Get node master
-                AlignNodesVertically(xpnm, keyMod) # Run the main function
-        # Redshift
-        for m in materials: # Iterate through materials
-            if m.GetBit(c4d.BIT_ACTIVE): # If material is selected
-                rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
-                AlignNodesVertically(rsnm, keyMod) # Run the main function
-    except: # Otherwise
-        pass # Do nothing
+    nodeMasters = GetNodeMasters(doc) # Collect target graphs up front
+    for nodeMaster in nodeMasters: # Process every graph independently
+        AlignNodesVertically(nodeMaster, keyMod) # Run the main function
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
 
@@ -4,7 +4,7 @@ AR_NodeCon
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeCon
-Version: 1.0.2
+Version: 1.1.0
 Description-US: Connects two selected nodes, if possible. Supports Redshift and Xpresso graphs
 
 Notice: Make sure the Xpresso tag or the Redshift material is selected when using the script!
@@ -13,6 +13,7 @@ Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.0 (19.10.2026) - Free ports are looked up from a port table built once per run
 1.0.2 (19.10.2023) - Update for Cinema 4D 2024
 1.0.1 (07.10.2021) - Updated for R25
 """
@@ -24,6 +25,7 @@ try:
 except:
     pass
 from operator import attrgetter
+from collections import deque
 from c4d import utils as u
 
 # Classes
@@ -35,6 +37,27 @@ class nodeObject(object):
         self.sx = sx # X scale
         self.sy = sy # Y scale
 
+class PortTable(object):
+    def __init__(self, nodes):
+        self.free = {} # (node, is input): deque of free ports
+        self.ports = {} # (node, is input): ports
+        for node in nodes: # Snapshot free ports once
+            outPorts = node.GetOutPorts() # Get outports
+            inPorts = node.GetInPorts() # Get inports
+            self.ports[(node, False)] = outPorts
+            self.ports[(node, True)] = inPorts
+            self.free[(node, False)] = deque(p for p in outPorts if p.GetNrOfConnections() == 0)
+            self.free[(node, True)] = deque(p for p in inPorts if p.GetNrOfConnections() == 0)
+
+    def FreePort(self, node, isInput, last=False):
+        free = self.free[(node, isInput)]
+        if len(free) != 0: # Take free port and mark it used
+            return free.pop() if last else free.popleft()
+        ports = self.ports[(node, isInput)]
+        if len(ports) == 0:
+            return None
+        return ports[-1] if last else ports[0] # Every port is in use
+
 # Functions
 def GetKeyMod():
     bc = c4d.BaseContainer() # Initialize a base container
@@ -62,18 +85,6 @@ def GetKeyMod():
             keyMod = 'None'
         return keyMod
 
-def GetPort(ports):
-    for i, port in enumerate(ports):
-        if port.GetNrOfConnections() == 0:
-            return port
-    return ports[0]
-
-def GetLastPort(ports):
-    for i, port in enumerate(reversed(ports)):
-        if port.GetNrOfConnections() == 0:
-            return port
-    return ports[-1]
-
 def ConnectNodes(nodeMaster, keyMod):
     if keyMod == "Shift":
         fromPort = int(c4d.gui.InputDialog("From port number", 0))
@@ -96,20 +107,22 @@ def ConnectNodes(nodeMaster, keyMod):
     if nodes: # If there is nodes
         firstNode = min(nodes, key=attrgetter('px')) # Get the node with the minimum x position value
         #lastNode = max(nodes, key=attrgetter('px')) # Get the node with the maximum x position value
+        table = PortTable([n.node for n in nodes]) # Snapshot free ports once
         for nodeObj in nodes:
             if nodeObj.node != firstNode.node:
                 if keyMod == "None":
-                    outPort = GetPort(firstNode.node.GetOutPorts()) # Get out port
-                    inPort = GetPort(nodeObj.node.GetInPorts()) # Get in port
+                    outPort = table.FreePort(firstNode.node, False) # Get out port
+                    inPort = table.FreePort(nodeObj.node, True) # Get in port
                 elif keyMod == "Shift":
                     outPortNr = fromPort
                     inPortNr = toPort
                     outPort = firstNode.node.GetOutPort(outPortNr)
                     inPort = nodeObj.node.GetInPort(inPortNr)
                 elif keyMod == "Ctrl":
-                    outPort = GetLastPort(firstNode.node.GetOutPorts()) # Get out port
-                    inPort = GetLastPort(nodeObj.node.GetInPorts()) # Get in port                
-                outPort.Connect(inPort) # Connect ports
+                    outPort = table.FreePort(firstNode.node, False, last=True) # Get out port
+                    inPort = table.FreePort(nodeObj.node, True, last=True) # Get in port
+                if outPort and inPort: # If both nodes have ports
+                    outPort.Connect(inPort) # Connect ports
 
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active document
@@ -4,7 +4,7 @@ AR_NodeDiscon
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeDiscon
-Version: 1.0.1
+Version: 1.1.0
 Description-US: Disconnect all connection(s) of selected node or connection(s) between selected nodes.
 
 Notice: Make sure the Xpresso tag or the Redshift material is selected when using the script!
@@ -13,6 +13,7 @@ Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.0 (19.10.2026) - Connections of the selected nodes are collected once per run
 1.0.1 (07.10.2021) - Updated for R25
 """
 
@@ -25,6 +26,14 @@ except:
 from c4d import utils as u
 
 # Functions
+def CollectConnections(nodes):
+    links = {} # (source node, destination node): [[out port, in port]]
+    for node in nodes: # Snapshot every connection once
+        for outPort in node.GetOutPorts(): # Iterate through outPorts
+            for destPort in outPort.GetDestination(): # Iterate through destination ports
+                links.setdefault((node, destPort.GetNode()), []).append([outPort, destPort])
+    return links
+
 def RemoveConnection(nodeMaster):
     nodes = [] # Initialize a list
     root = nodeMaster.GetRoot() # Get node master root
@@ -35,14 +44,11 @@ def RemoveConnection(nodeMaster):
 
     cnt = len(nodes) # Get amount of nodes
     if cnt >= 2: # If more than 1 node selected
-        for node in nodes: # Iterate through nodes
-            outPorts = node.GetOutPorts() # Get outports
-            for outPort in outPorts: # Iterate through outPorts
-                destPorts = outPort.GetDestination() # Get destination ports
-                for destPort in destPorts: # Iterate through destination ports
-                    destNode = destPort.GetNode() # Get destination node
-                    if destNode.GetBit(c4d.BIT_ACTIVE): # If destination node is selected
-                        destPort.Remove() # Remove connection
+        links = CollectConnections(nodes) # Snapshot connections of selected nodes once
+        for (node, destNode), connections in links.items(): # Iterate through connections
+            if destNode.GetBit(c4d.BIT_ACTIVE): # If destination node is selected
+                for outPort, destPort in connections:
+                    destPort.Remove() # Remove connection
     else: # Otherwise
         nodes[0].RemoveConnections() # Remove all connections
 
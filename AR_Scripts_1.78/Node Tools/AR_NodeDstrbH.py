@@ -4,7 +4,7 @@ AR_NodeDstrbH
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeDstrbH
-Version: 1.0.2
+Version: 1.1.1
 Description-US: Distributes selected nodes horizontally, supports Xpresso and Redshift
 
 Notice: Make sure the Xpresso tag or the Redshift material is selected when using the script!
@@ -13,6 +13,8 @@ Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.1 (19.10.2026) - Target graphs are collected up front from selected Xpresso tags and selected materials only
+1.1.0 (19.10.2026) - Node geometry is read in one pass to flat lists and only changed nodes are written back with one undo
 1.0.2 (19.10.2023) - Update for Cinema 4D 2024
 1.0.1 (07.10.2021) - Updated for R25
 """
@@ -23,77 +25,94 @@ try:
     import redshift
 except:
     pass
-from operator import attrgetter
 from c4d import utils as u
 
 # Classes
-class nodeObject(object):
-    def __init__(self, obj, px, py, sx, sy):
-        self.node = obj # Node object
-        self.px = px # X position
-        self.py = py # Y position
-        self.sx = sx # X scale
-        self.sy = sy # Y scale
+class NodeLayout(object):
+    def __init__(self, nodeMaster):
+        self.nodeMaster = nodeMaster # Node master
+        self.nodes = [] # Selected nodes
+        self.containers = [] # Operator container instances of the nodes
+        self.px = [] # X positions
+        self.py = [] # Y positions
+        self.sx = [] # X scales
+        self.sy = [] # Y scales
+        root = nodeMaster.GetRoot() # Get node master root
+        for node in root.GetChildren(): # Iterate through nodes, only once
+            if node.GetBit(c4d.BIT_ACTIVE): # If node is selected
+                bc  = node.GetDataInstance() # Get base container
+                bsc = bc.GetContainerInstance(c4d.ID_SHAPECONTAINER) # Get shape container
+                bcd = bsc.GetContainerInstance(c4d.ID_OPERATORCONTAINER) # Get operator container
+                self.nodes.append(node)
+                self.containers.append(bcd)
+                self.px.append(bcd.GetReal(100)) # Get x position
+                self.py.append(bcd.GetReal(101)) # Get y position
+                self.sx.append(bcd.GetReal(108)) # Get x scale
+                self.sy.append(bcd.GetReal(109)) # Get y scale
+        self.snapshot = (list(self.px), list(self.py), list(self.sx), list(self.sy)) # Original values
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def Order(self, values, reverse=False):
+        return sorted(range(len(values)), key=values.__getitem__, reverse=reverse) # Sorted node indices
+
+    def Apply(self):
+        changed = [i for i in range(len(self.nodes)) if (self.px[i], self.py[i], self.sx[i], self.sy[i]) !=
+                   (self.snapshot[0][i], self.snapshot[1][i], self.snapshot[2][i], self.snapshot[3][i])]
+        if not changed: # Nothing to write
+            return 0
+        self.nodeMaster.AddUndo() # Add undo for changing nodes, only once
+        for i in changed: # Write back only changed nodes
+            bcd = self.containers[i]
+            bcd.SetReal(100, self.px[i]) # Set x position
+            bcd.SetReal(101, self.py[i]) # Set y position
+            bcd.SetReal(108, self.sx[i]) # Set x scale
+            bcd.SetReal(109, self.sy[i]) # Set y scale
+        return len(changed)
 
 # Functions
 def DistributeNodes(nodeMaster):
-    nodes = [] # Initialize a list
-    root = nodeMaster.GetRoot() # Get node master root
-    for node in root.GetChildren(): # Iterate through nodes
-        if node.GetBit(c4d.BIT_ACTIVE): # If node is selected
-            bc  = node.GetDataInstance() # Get copy of base container
-            bsc = bc.GetContainer(c4d.ID_SHAPECONTAINER) # Get copy of shape container
-            bcd = bsc.GetContainer(c4d.ID_OPERATORCONTAINER) # Get copy of operator container
-            px  = bcd.GetReal(100) # Get x position
-            py  = bcd.GetReal(101) # Get y position
-            sx  = bcd.GetReal(108) # Get x scale
-            sy  = bcd.GetReal(109) # Get y scale
-            nodes.append(nodeObject(node, px, py, sx, sy)) # Create nodeObject and add it to a list
-            
-    if nodes: # If there is nodes
-        firstNode = min(nodes, key=attrgetter('px')) # Get the node with the minimum x position value
-        lastNode  = max(nodes, key=attrgetter('px')) # Get the node with the maximum x position value
-        fpos = firstNode.px + firstNode.sx # Get first position
-        lpos = lastNode.px # Get last position
-        nodes.sort(key=attrgetter('px')) # Sort nodes by x position
-        totalScale = 0 # Init total scale variable
-        for i in range (len(nodes)): # Iterate through nodes
-            if i != 0 and i != len(nodes)-1: # Not first nor last
-                totalScale = totalScale + nodes[i].sx # Calculate total scale
-        distance = lpos - fpos # Calculate distance between first and last node
-        count = len(nodes) # Get count of nodes
-        gap = float((distance-totalScale))/float((count-1)) # Calculate gap between nodes
-        r = fpos # Initialize a r variable
+    layout = NodeLayout(nodeMaster) # Snapshot selected nodes
+    if len(layout) < 3: # Nothing to distribute
+        return
+    order = layout.Order(layout.px) # Node indices sorted by x position
+    first = order[0] # The node with the minimum x position value
+    last = order[-1] # The node with the maximum x position value
+    fpos = layout.px[first] + layout.sx[first] # Get first position
+    lpos = layout.px[last] # Get last position
+    totalScale = sum(layout.sx[i] for i in order[1:-1]) # Calculate total scale, not first nor last
+    gap = float(lpos - fpos - totalScale) / float(len(order) - 1) # Calculate gap between nodes
+
+    r = fpos # Initialize a r variable
     helper = 0 # Initialize a helper variable
-    nodeMaster.AddUndo() # Add undo for changing nodes
-    for i in range(0, len(nodes)): # Iterate through collected nodes
-        node=  nodes[i].node # Get node
-        bc  = node.GetDataInstance() # Get base container
-        bsc = bc.GetContainerInstance(c4d.ID_SHAPECONTAINER) # Get shape container
-        bcd = bsc.GetContainerInstance(c4d.ID_OPERATORCONTAINER) # Get operator container
-        if i != 0 and i != len(nodes)-1: # Not first nor last node
-            s = nodes[i].sx # Get node length
-            r = r + gap + helper # Calculate node position
-            helper = s # Set helper
-            bcd.SetReal(100, r) # Set x position
+    for i in order[1:-1]: # Iterate through nodes, not first nor last
+        r = r + gap + helper # Calculate node position
+        helper = layout.sx[i] # Set helper
+        layout.px[i] = r # Set x position
+
+    layout.Apply() # Write new positions
+
+def GetNodeMasters(doc):
+    nodeMasters = [] # Initialize a list for target graphs
+    for s in doc.GetSelection(): # Iterate through selection
+        if type(s).__name__ == "XPressoTag": # If operator is xpresso tag
+            nodeMasters.append(s.GetNodeMaster()) # Get node master
+    for m in doc.GetActiveMaterials(): # Iterate through selected materials only
+        try:
+            rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
+        except:
+            continue
+        if rsnm is not None:
+            nodeMasters.append(rsnm)
+    return nodeMasters
 
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
     doc.StartUndo() # Start recording undos
-    materials = doc.GetMaterials() # Get materials
-    selection = doc.GetSelection() # Get active selection
-    try: # Try to execute following script
-        # Xpresso
-        for s in selection: # Iterate through selection
-            if type(s).__name__ == "XPressoTag": # If operator is xpresso tag
-                xpnm = s.GetNodeMaster() # Get node master
-                DistributeNodes(xpnm) # Run the main function
-        for m in materials: # Iterate through materials
-            if m.GetBit(c4d.BIT_ACTIVE): # If material is selected
-                rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
-                DistributeNodes(rsnm) # Run the main function
-    except: # Otherwise
-        pass # Do nothing
+    nodeMasters = GetNodeMasters(doc) # Collect target graphs up front
+    for nodeMaster in nodeMasters: # Process every graph independently
+        DistributeNodes(nodeMaster) # Run the main function
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
 
@@ -4,7 +4,7 @@ AR_NodeLineUpV
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeLineUpV
-Version: 1.0.3
+Version: 1.1.1
 Description-US: Lines up selected graph nodes vertically, supports Xpresso and Redshift
 
 Notice: Make sure the Xpresso tag or the Redshift material is selected when using the script!
@@ -16,6 +16,8 @@ To Do:
     > Add keyboard modification to horizontal alignment (left, _center_, right)
 
 Change log:
+1.1.1 (19.10.2026) - Target graphs are collected up front from selected Xpresso tags and selected materials only
+1.1.0 (19.10.2026) - Node geometry is read in one pass to flat lists and only changed nodes are written back with one undo
 1.0.3 (19.10.2023) - Update for Cinema 4D 2024
 1.0.2 (07.10.2021) - Updated for R25
 1.0.1 (17.02.2021) - Alt modifier: The lowest node rules
@@ -27,73 +29,98 @@ try:
     import redshift
 except:
     pass
-from operator import attrgetter
 from c4d import utils as u
 
 # Classes
-class nodeObject(object):
-    def __init__(self, obj, px, py, sx, sy):
-        self.node = obj # Node object
-        self.px = px # X position
-        self.py = py # Y position
-        self.sx = sx # X scale
-        self.sy = sy # Y scale
+class NodeLayout(object):
+    def __init__(self, nodeMaster):
+        self.nodeMaster = nodeMaster # Node master
+        self.nodes = [] # Selected nodes
+        self.containers = [] # Operator container instances of the nodes
+        self.px = [] # X positions
+        self.py = [] # Y positions
+        self.sx = [] # X scales
+        self.sy = [] # Y scales
+        root = nodeMaster.GetRoot() # Get node master root
+        for node in root.GetChildren(): # Iterate through nodes, only once
+            if node.GetBit(c4d.BIT_ACTIVE): # If node is selected
+                bc  = node.GetDataInstance() # Get base container
+                bsc = bc.GetContainerInstance(c4d.ID_SHAPECONTAINER) # Get shape container
+                bcd = bsc.GetContainerInstance(c4d.ID_OPERATORCONTAINER) # Get operator container
+                self.nodes.append(node)
+                self.containers.append(bcd)
+                self.px.append(bcd.GetReal(100)) # Get x position
+                self.py.append(bcd.GetReal(101)) # Get y position
+                self.sx.append(bcd.GetReal(108)) # Get x scale
+                self.sy.append(bcd.GetReal(109)) # Get y scale
+        self.snapshot = (list(self.px), list(self.py), list(self.sx), list(self.sy)) # Original values
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def Order(self, values, reverse=False):
+        return sorted(range(len(values)), key=values.__getitem__, reverse=reverse) # Sorted node indices
+
+    def Apply(self):
+        changed = [i for i in range(len(self.nodes)) if (self.px[i], self.py[i], self.sx[i], self.sy[i]) !=
+                   (self.snapshot[0][i], self.snapshot[1][i], self.snapshot[2][i], self.snapshot[3][i])]
+        if not changed: # Nothing to write
+            return 0
+        self.nodeMaster.AddUndo() # Add undo for changing nodes, only once
+        for i in changed: # Write back only changed nodes
+            bcd = self.containers[i]
+            bcd.SetReal(100, self.px[i]) # Set x position
+            bcd.SetReal(101, self.py[i]) # Set y position
+            bcd.SetReal(108, self.sx[i]) # Set x scale
+            bcd.SetReal(109, self.sy[i]) # Set y scale
+        return len(changed)
 
 # Functions
 def DistributeNodes(nodeMaster, keyMod):
-    nodes = [] # Initialize a list
-    root = nodeMaster.GetRoot() # Get node master root
-    for node in root.GetChildren(): # Iterate through nodes
-        if node.GetBit(c4d.BIT_ACTIVE): # If node is selected
-            bc  = node.GetDataInstance() # Get copy of base container
-            bsc = bc.GetContainer(c4d.ID_SHAPECONTAINER) # Get copy of shape container
-            bcd = bsc.GetContainer(c4d.ID_OPERATORCONTAINER) # Get copy of operator container
-            px  = bcd.GetReal(100) # Get x position
-            py  = bcd.GetReal(101) # Get y position
-            sx  = bcd.GetReal(108) # Get x scale
-            sy  = bcd.GetReal(109) # Get y scale
-            nodes.append(nodeObject(node, px, py, sx, sy)) # Create nodeObject and add it to the list
-
-    if nodes: # If there is nodes
-        if (keyMod == "Alt") or (keyMod == "Alt+Shift"):
-            firstNode = max(nodes, key=attrgetter('py')) # Get the node with the maximum y position value
-            nodes.sort(key=attrgetter('py')) # Sort nodes by y position
-            nodes.reverse()
-            fpos = firstNode.py # Get first position
-        else:
-            firstNode = min(nodes, key=attrgetter('py')) # Get the node with the minimum y position value
-            nodes.sort(key=attrgetter('py')) # Sort nodes by y position
-            fpos = firstNode.py + firstNode.sy # Get first position
-        count = len(nodes) # Get count of nodes
-        r = fpos # Initialize a r variable
-    helper = 0 # Initialize a helper variable
-    nodeMaster.AddUndo() # Add undo for changing nodes
-
-    if (keyMod == "None") or (keyMod == "Alt"):
-        gap = 20
-    elif (keyMod == "Shift") or (keyMod == "Alt+Shift"):
+    layout = NodeLayout(nodeMaster) # Snapshot selected nodes
+    if len(layout) == 0: # If no selected nodes
+        return
+    if (keyMod == "Alt") or (keyMod == "Alt+Shift"):
+        order = layout.Order(layout.py, True) # Node indices sorted by y position, the lowest first
+        first = order[0]
+        fpos = layout.py[first] # Get first position
+    else:
+        order = layout.Order(layout.py) # Node indices sorted by y position, the highest first
+        first = order[0]
+        fpos = layout.py[first] + layout.sy[first] # Get first position
+
+    gap = 20
+    if (keyMod == "Shift") or (keyMod == "Alt+Shift"):
         gap = float(c4d.gui.InputDialog("Gap size", 20))
 
-    for i in range(0, len(nodes)): # Iterate through collected nodes
-        node=  nodes[i].node # Get node
-        bc  = node.GetDataInstance() # Get base container
-        bsc = bc.GetContainerInstance(c4d.ID_SHAPECONTAINER) # Get shape container
-        bcd = bsc.GetContainerInstance(c4d.ID_OPERATORCONTAINER) # Get operator container
-
-        if i != 0: # Not first node
-            s = nodes[i].sy # Get node length
-            tAnchor = nodes[i].sx / 2.0
-            sAnchor = (firstNode.px + (firstNode.sx / 2.0))
-            p = (sAnchor - tAnchor)
-
-            if (keyMod == "Alt+Shift") or (keyMod == "Alt"):
-                r = r - gap - s # Calculate node position
-            else:
-                r = r + gap + helper # Calculate node position
-
-            helper = s # Set helper
-            bcd.SetReal(100, p) # Set x position
-            bcd.SetReal(101, r) # Set y position
+    anchor = layout.px[first] + (layout.sx[first] / 2.0) # Middle of the first node
+    r = fpos # Initialize a r variable
+    helper = 0 # Initialize a helper variable
+    for i in order[1:]: # Iterate through nodes, not first node
+        s = layout.sy[i] # Get node length
+        if (keyMod == "Alt+Shift") or (keyMod == "Alt"):
+            r = r - gap - s # Calculate node position
+        else:
+            r = r + gap + helper # Calculate node position
+        helper = s # Set helper
+        layout.py[i] = r # Set y position
+        layout.px[i] = anchor - (layout.sx[i] / 2.0) # Set x position
+
+    layout.Apply() # Write new positions
+
+def GetNodeMasters(doc):
+    nodeMasters = [] # Initialize a list for target graphs
+    for s in doc.GetSelection(): # Iterate through selection
+        if type(s).__name__ == "XPressoTag": # If operator is xpresso tag
+            nodeMasters.append(s.GetNodeMaster()) # Get node master
+    for m in doc.GetActiveMaterials(): # Iterate through selected materials only
+        try:
+            rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
+        except:
+            continue
+        if rsnm is not None:
+            nodeMasters.append(rsnm)
+    return nodeMasters
 
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active document
@@ -121,20 +148,9 @@ def main():
         else: # No keyboard modifiers used
             keyMod = 'None'
     doc.StartUndo() # Start recording undos
-    materials = doc.GetMaterials() # Get materials
-    selection = doc.GetSelection() # Get active selection
-    try: # Try to execute following script
-        # Xpresso
-        for s in selection: # Iterate through selection
-            if type(s).__name__ == "XPressoTag": # If operator is xpresso tag
-                xpnm = s.GetNodeMaster() # Get node master
-                DistributeNodes(xpnm, keyMod) # Run the main function
-        for m in materials: # Iterate through materials
-            if m.GetBit(c4d.BIT_ACTIVE): # If material is selected
-                rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
-                DistributeNodes(rsnm, keyMod) # Run the main function
-    except: # Otherwise
-        pass # Do nothing
+    nodeMasters = GetNodeMasters(doc) # Collect target graphs up front
+    for nodeMaster in nodeMasters: # Process every graph independently
+        DistributeNodes(nodeMaster, keyMod) # Run the main function
     doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
 
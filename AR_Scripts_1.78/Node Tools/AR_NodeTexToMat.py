@@ -4,8 +4,8 @@ AR_NodeTexToMat
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_NodeTexToMat
-Version: 1.0.2
-Description-US: Creates material node from selected texture nodes (Only for Redshift).
+Version: 1.2.2
+Description-US: Creates material node from selected texture nodes (Only for Redshift). Shift: Creates a material for every texture set in a folder tree.
 
 Notice: Make sure the Redshift material is selected when using the script!
 
@@ -13,6 +13,10 @@ Written for Maxon Cinema 4D R26.014
 Python version 3.9.1
 
 Change log:
+1.2.2 (19.10.2026) - A keyword listed under several map types matches all of them again
+1.2.1 (19.10.2026) - Batch mode removes the default material node and skips unreadable folders
+1.2.0 (19.10.2026) - Shift: Batch mode, scans a texture folder tree and creates one wired Redshift material per texture set
+1.1.0 (19.10.2026) - Texture paths are classified with one precompiled regex (named group per map type) in one scan
 1.0.2 (19.10.2023) - Update for Cinema 4D 2024
 1.0.1 (03.04.2024) - Bug fixes
 1.0.0 (19.05.2022) - First version
@@ -27,6 +31,8 @@ from pathlib import Path
 import re
 import os
 import sys
+import time
+from functools import lru_cache
 try:
     import redshift
 except:
@@ -85,6 +91,10 @@ EDT_EMISSION    = 3016
 BTN_OK          = 7001
 BTN_CANCEL      = 7002
 
+MAP_TYPES       = ['color', 'roughness', 'glossiness', 'normal', 'height', 'displacement', 'metal', 'opacity', 'emission']
+IMAGE_EXTS      = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr', '.tga', '.psd', '.bmp', '.tx'}
+setSeparators   = re.compile(r"[\W_]+") # Runs of separators left after removing the map keyword
+
 # Classes
 class nodeObject(object):
     def __init__(self, obj, px, py, sx, sy):
@@ -334,17 +344,34 @@ def CheckConnection(nodeA, nodeB):
                 a.append([outPort, destPort])
     return a
 
-def SearchMap(node, path, maps):
-    if path == "":
-        return None
-    if len(maps) == 0 and maps == None:
+@lru_cache(maxsize=8)
+def CompileClassifier(keywords, flags=0):
+    groups = [] # Initialize a list for keyword groups, one per map type
+    types = [] # Map type and its own keyword pattern
+    for mapType, string in keywords: # Iterate through map types
+        maps = [m for m in StringToMaps(string) if m != ""] # Keywords of the map type
+        if len(maps) != 0:
+            groups.append("(?:%s)" % "|".join(maps))
+            types.append((mapType, re.compile("(?:%s)" % "|".join(maps), flags)))
+    if len(groups) == 0: # No keywords at all
         return None
-    for m in maps:
-        if m != "" and m != " ":
-            found = re.search("(?<![^\\W_])"+m+"(?![^\\W_])", path)
-            if found:
-                return node
-    return None
+    scanner = re.compile("(?<![^\\W_])(?:" + "|".join(groups) + ")(?![^\\W_])", flags) # One regex for every map type
+    return scanner, tuple(types)
+
+def MatchTypes(classifier, match):
+    keyword = match.group() # Matched keyword
+    return [mapType for mapType, pattern in classifier[1] if pattern.fullmatch(keyword)] # Keyword can be listed under several map types
+
+def GetClassifier(options, flags=0):
+    return CompileClassifier(tuple((t, options[t]) for t in MAP_TYPES), flags) # Cached by the options
+
+def ClassifyPath(classifier, path):
+    found = set() # Initialize a set for found map types
+    if classifier is None or path == "":
+        return found
+    for match in classifier[0].finditer(path): # Scan the path only once
+        found.update(MatchTypes(classifier, match))
+    return found
 
 def NodeSetPosition(node, x, y):
     bc  = node.GetDataInstance() # Get base container
@@ -479,6 +506,118 @@ def AddPorts(material, outputNode, x, colorMap, roughMap, glossMap, normalMap, h
 
     # -----------------------------------------------------------------------------------------------------------
 
+def ScanTextures(folder):
+    files = [] # Initialize a list for image files
+    stack = [folder] # Folders to scan
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries: # One directory listing per folder
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False): # Sub folder
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS: # Image file
+                        files.append(entry.path)
+        except OSError: # No permission or broken link, skip the folder
+            pass
+    return sorted(files)
+
+def GroupTextureSets(files, classifier):
+    sets = {} # (folder, set name): {map type: file path}
+    for path in files: # Iterate through image files
+        folder, fileName = os.path.split(path)
+        stem = os.path.splitext(fileName)[0]
+        matches = [m for m in classifier[0].finditer(stem)] if classifier else []
+        if len(matches) == 0: # Not a recognized map
+            continue
+        name = stem
+        for m in reversed(matches): # Remove map keywords, the rest is the set name
+            name = name[:m.start()] + "_" + name[m.end():]
+        name = setSeparators.sub("_", name).strip("_") or os.path.basename(folder)
+        maps = sets.setdefault((folder, name), {})
+        for m in matches:
+            for mapType in MatchTypes(classifier, m):
+                if mapType not in maps: # First file wins
+                    maps[mapType] = path
+    return sets
+
+def CreateTextureNode(nodeMaster, root, path, mapType, x, y):
+    node = nodeMaster.CreateNode(root, 1036227, None, x = -1, y = -1) # Create a redshift node
+    node[c4d.GV_REDSHIFT_SHADER_META_CLASSNAME] = "TextureSampler" # Set node type
+    node[c4d.REDSHIFT_SHADER_TEXTURESAMPLER_TEX0, c4d.REDSHIFT_FILE_PATH] = path # Image path
+    if mapType not in ('color', 'emission'): # Data maps
+        node[c4d.REDSHIFT_SHADER_TEXTURESAMPLER_TEX0, c4d.REDSHIFT_FILE_COLORSPACE] = "RS_INPUT_COLORSPACE_RAW"
+    node.SetName(os.path.basename(path)) # Set node name
+    NodeSetPosition(node, x, y)
+    bcd = node.GetDataInstance().GetContainerInstance(c4d.ID_SHAPECONTAINER).GetContainerInstance(c4d.ID_OPERATORCONTAINER)
+    sx = bcd.GetReal(108) or 150 # Get x scale
+    sy = bcd.GetReal(109) or 50 # Get y scale
+    return nodeObject(node, x, y, sx, sy)
+
+def CreateMaterialFromSet(name, maps, matType):
+    mat = c4d.BaseMaterial(1036224) # Initialize legacy Redshift material
+    mat.SetName(name) # Set material name
+    nodeMaster = redshift.GetRSMaterialNodeMaster(mat) # Get Redshift material node master
+    root = nodeMaster.GetRoot() # Get node master root
+    outputNode = None
+    for node in root.GetChildren(): # Default graph, keep the output node and remove the default material node
+        if node.GetOperatorID() == 1036746:
+            outputNode = node
+        else:
+            node.Remove()
+
+    spacing = 100 # Vertical space between texture nodes
+    textures = {} # Map type: nodeObject
+    for i, mapType in enumerate(t for t in MAP_TYPES if t in maps): # Same order as in settings
+        textures[mapType] = CreateTextureNode(nodeMaster, root, maps[mapType], mapType, 0, i * spacing)
+
+    x = 500
+    material = nodeMaster.CreateNode(root, 1036227, None, x = -1, y = -1) # Create material node
+    if matType == MAT_RSSTD: # If RS Standard
+        material[c4d.GV_REDSHIFT_SHADER_META_CLASSNAME] = "StandardMaterial"
+    else: # RS Material
+        material[c4d.GV_REDSHIFT_SHADER_META_CLASSNAME] = "Material"
+    material[c4d.ID_GVBASE_COLOR] = c4d.Vector(0.529, 0.345, 0.333)
+    NodeSetPosition(material, x, (len(textures) - 1) * spacing * 0.5)
+    if outputNode:
+        material.GetOutPort(0).Connect(outputNode.GetInPorts()[0]) # Connect surface
+        NodeSetPosition(outputNode, x + 250, (len(textures) - 1) * spacing * 0.5)
+
+    AddPorts(material, outputNode, x,
+             textures.get('color'),
+             textures.get('roughness'),
+             textures.get('glossiness'),
+             textures.get('normal'),
+             textures.get('height'),
+             textures.get('displacement'),
+             textures.get('opacity'),
+             textures.get('metal'),
+             textures.get('emission'))
+    return mat
+
+def BatchTexToMat(doc, folder):
+    global options
+
+    start = time.time()
+    classifier = GetClassifier(options, re.IGNORECASE) # Compiled map keywords, file names in any case
+    sets = GroupTextureSets(ScanTextures(folder), classifier) # Texture sets
+    count = len(sets)
+    if count == 0:
+        return 0
+
+    for i, key in enumerate(sorted(sets)): # Iterate through texture sets
+        mat = CreateMaterialFromSet(key[1], sets[key], options['material'])
+        doc.InsertMaterial(mat) # Add material to the document
+        doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, mat) # Record undo for creating the material
+        if i % 25 == 0: # Update status bar once in a while
+            c4d.StatusSetBar(int(100.0 * i / count))
+            c4d.StatusSetText("Creating materials %s/%s" % (i, count))
+
+    elapsed = max(time.time() - start, 0.001)
+    c4d.StatusClear()
+    print("AR_NodeTexToMat: %s material(s) created in %.2f s (%.1f sets/s)" % (count, elapsed, count / elapsed))
+    c4d.StatusSetText("%s material(s) created (%.1f sets/s)" % (count, count / elapsed))
+    return count
+
 def CreateTexToMat(nodeMaster):
     global options
 
@@ -510,63 +649,27 @@ def CreateTexToMat(nodeMaster):
         firstNode = min(nodes, key=attrgetter('py')) # Get the node with the minimum y position value
         lastNode  = max(nodes, key=attrgetter('py')) # Get the node with the maximum y position value
 
-        # Arrays
-        colors    = StringToMaps(options['color'])
-        normals   = StringToMaps(options['normal'])
-        heights   = StringToMaps(options['height'])
-        disps     = StringToMaps(options['displacement'])
-        roughs    = StringToMaps(options['roughness'])
-        glosses   = StringToMaps(options['glossiness'])
-        opacities = StringToMaps(options['opacity'])
-        metals    = StringToMaps(options['metal'])
-        emissions = StringToMaps(options['emission'])
+        classifier = GetClassifier(options) # Compiled map keywords
 
         # Maps
-        colorMap   = None
-        roughMap   = None
-        glossMap   = None
-        normalMap  = None
-        heightMap  = None
-        dispMap    = None
-        opacityMap = None
-        metalMap   = None
-        emissionMap= None
-
+        found = {} # Map type: the first node found
         for n in nodes: # Iterate through collected nodes
             if n.node.GetOperatorID() == 1036227:
                 if n.node[c4d.GV_REDSHIFT_SHADER_META_CLASSNAME] == "TextureSampler": # Node is a texture node
                     path = n.node[c4d.REDSHIFT_SHADER_TEXTURESAMPLER_TEX0, c4d.REDSHIFT_FILE_PATH] # Get file path
-                    name = Path(path).stem
-
-                    if not colorMap:
-                        colorMap   = SearchMap(n, path, colors)
-
-                    if not normalMap:
-                        normalMap  = SearchMap(n, path, normals)
-
-                    if not heightMap:
-                        heightMap  = SearchMap(n, path, heights)
-
-                    if not dispMap:
-                        dispMap    = SearchMap(n, path, disps)
-
-                    if not opacityMap:
-                        opacityMap = SearchMap(n, path, opacities)
-
-                    if not roughMap:
-                        roughMap   = SearchMap(n, path, roughs)
-
-                    if not glossMap:
-                        glossMap   = SearchMap(n, path, glosses)
-
-                    if not metalMap:
-                        metalMap   = SearchMap(n, path, metals)
-
-                    if not metalMap:
-                        metalMap   = SearchMap(n, path, metals)
-
-                    if not emissionMap:
-                        emissionMap= SearchMap(n, path, emissions)
+                    for mapType in ClassifyPath(classifier, path):
+                        if mapType not in found:
+                            found[mapType] = n
+
+        colorMap   = found.get('color')
+        roughMap   = found.get('roughness')
+        glossMap   = found.get('glossiness')
+        normalMap  = found.get('normal')
+        heightMap  = found.get('height')
+        dispMap    = found.get('displacement')
+        opacityMap = found.get('opacity')
+        metalMap   = found.get('metal')
+        emissionMap= found.get('emission')
 
         # Checking stuff
         allMaps = [colorMap,
@@ -618,6 +721,11 @@ def main():
             if m.GetBit(c4d.BIT_ACTIVE): # If material is selected
                 rsnm = redshift.GetRSMaterialNodeMaster(m) # Get Redshift material node master
                 CreateTexToMat(rsnm) # Run the main function
+    elif keyMod == "Shift": # Build materials for every texture set in a folder tree
+        options = loadSettings() # Load settings
+        folder = storage.LoadDialog(c4d.FILESELECTTYPE_ANYTHING,'Select texture folder',c4d.FILESELECT_DIRECTORY,'')
+        if folder:
+            BatchTexToMat(doc, folder)
     elif keyMod == "Alt+Ctrl+Shift":
         dlg = Dialog() # Create dialog object
         dlg.Open(c4d.DLG_TYPE_MODAL, 0, -1, -1, 0, 0) # Open dialog
@@ -4,101 +4,73 @@ AR_MergeSelectionTags
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_MergeSelectionTags
-Version: 1.0.1
+Version: 1.1.0
 Description-US: Merges selection tags, supports object and tag selections
 
 Written for Maxon Cinema 4D R25.010
 Python version 3.9.1
 
 Change log:
+1.1.0 (19.10.2026) - Tags are indexed by object in one pass and merged with one combined range operation
 1.0.1 (05.03.2022) - Updated to R25 and fixed naming conflict
 """
 # Libraries
 import c4d
 
 # Functions
-def SortTags(collectedTags):
-    polyTags = [] # Init list for polygon selection tags
-    edgeTags = [] # Init list for edge selection tags
-    pointTags = [] # Init list for point selection tags
-    objects = [] # Init list for objects
+def SortTags(collectedTags, index=None):
+    if index is None:
+        index = {} # Init dictionary for tags, object GUID: {tag type: [tags]}
 
     # Sort
     for t in collectedTags:
-        if t.GetType() == 5673: # Polygon selection
-            polyTags.append(t)
-            objects.append(t.GetObject().GetGUID())
-        elif t.GetType() == 5701: # Edge selection
-            edgeTags.append(t)
-            objects.append(t.GetObject().GetGUID())
-        elif t.GetType() == 5674: # Point selection
-            pointTags.append(t)
-            objects.append(t.GetObject().GetGUID())
-
-    objects = list(dict.fromkeys(objects)) # Remove duplicates
-    return polyTags, edgeTags, pointTags, objects
-
-def MergePolySelectionTags(polyTags, edgeTags, pointTags, objects):
+        tagType = t.GetType()
+        if tagType not in (5673, 5701, 5674): # Polygon, edge or point selection
+            continue
+        obj = t.GetObject()
+        if obj is None:
+            continue
+        groups = index.setdefault(obj.GetGUID(), {5673: [], 5701: [], 5674: []})
+        groups[tagType].append(t)
+    return index
+
+def MergeRanges(selects):
+    ranges = [] # Init list for selected ranges
+    for bs in selects:
+        for seg in range(bs.GetSegments()):
+            ranges.append(bs.GetRange(seg, c4d.MAXLONGl))
+    ranges.sort()
+
+    merged = c4d.BaseSelect() # Initialize a base select
+    current = None
+    for a, b in ranges: # Coalesce overlapping and adjacent ranges
+        if current is not None and a <= current[1] + 1:
+            current[1] = max(current[1], b)
+            continue
+        if current is not None:
+            merged.SelectAll(current[1], current[0])
+        current = [a, b]
+    if current is not None:
+        merged.SelectAll(current[1], current[0])
+    return merged
+
+def MergePolySelectionTags(index):
     removeList = []
-    for o in objects:
-        objPolyTags = []
-        objEdgeTags = []
-        objPointTags = []
-
-        for t in polyTags:
-            k = t.GetObject()
-            if k != None:
-                if k.GetGUID() == o:
-                    objPolyTags.append(t)
-        for t in edgeTags:
-            k = t.GetObject()
-            if k != None:
-                if k.GetGUID() == o:
-                    objEdgeTags.append(t)
-        for t in pointTags:
-            k = t.GetObject()
-            if k != None:
-                if k.GetGUID() == o:
-                    objPointTags.append(t)
-
-        if len(objPolyTags) >= 2:
-            obj = objPolyTags[0].GetObject() # Get reference object
-            polyTag = c4d.SelectionTag(c4d.Tpolygonselection) # Initialize a poly selection tag
-            polyTag.SetName(objPolyTags[0].GetName()) # Use the name of the first selected tag
-            obj.InsertTag(polyTag, obj.GetLastTag()) # Insert tag to the object
-            doc.AddUndo(c4d.UNDOTYPE_NEW, polyTag) # Record undo for inserting a new tag
-            polySelection = polyTag.GetBaseSelect() # Initialize a polygon selection
-            for t in objPolyTags: # Iterate through tags
-                polySelection.Merge(t.GetBaseSelect()) # Merge selection
-                removeList.append(t)
-
-        # Edge tags
-        if len(objEdgeTags) >= 2:
-            obj = objEdgeTags[0].GetObject() # Get reference object
-            edgeTag = c4d.SelectionTag(c4d.Tedgeselection) # Initialize a edge selection tag
-            edgeTag.SetName(objEdgeTags[0].GetName()) # Use the name of the first selected tag
-            obj.InsertTag(edgeTag, obj.GetLastTag()) # Insert tag to the object
-            doc.AddUndo(c4d.UNDOTYPE_NEW, edgeTag) # Record undo for inserting a new tag
-            edgeSelection = edgeTag.GetBaseSelect() # Initialize a edge selection
-            for t in objEdgeTags: # Iterate through tags
-                edgeSelection.Merge(t.GetBaseSelect()) # Merge selection
-                removeList.append(t)
-
-        # Point tags
-        if len(objPointTags) >= 2:
-            obj = objPointTags[0].GetObject() # Get reference object
-            pointTag = c4d.SelectionTag(c4d.Tpointselection) # Initialize a point selection tag
-            pointTag.SetName(objPointTags[0].GetName()) # Use the name of the first selected tag
-            obj.InsertTag(pointTag, obj.GetLastTag()) # Insert tag to the object
-            doc.AddUndo(c4d.UNDOTYPE_NEW, pointTag) # Record undo for inserting a new tag
-            pointSelection = pointTag.GetBaseSelect() # Initialize a point selection
-            for t in objPointTags: # Iterate through tags
-                pointSelection.Merge(t.GetBaseSelect()) # Merge selection
-                removeList.append(t)
-
-        for t in removeList:
-            doc.AddUndo(c4d.UNDOTYPE_DELETE, t) # Record undo for deleting a tag
-            t.Remove() # Detele the tag
+    for groups in index.values():
+        for tagType, tags in groups.items():
+            if len(tags) < 2:
+                continue
+            obj = tags[0].GetObject() # Get reference object
+            newTag = c4d.SelectionTag(tagType) # Initialize a selection tag
+            newTag.SetName(tags[0].GetName()) # Use the name of the first selected tag
+            obj.InsertTag(newTag, obj.GetLastTag()) # Insert tag to the object
+            doc.AddUndo(c4d.UNDOTYPE_NEW, newTag) # Record undo for inserting a new tag
+            MergeRanges([t.GetBaseSelect() for t in tags]).CopyTo(newTag.GetBaseSelect()) # Merge selections
+            removeList.extend(tags)
+
+    for t in removeList:
+        doc.AddUndo(c4d.UNDOTYPE_DELETE, t) # Record undo for deleting a tag
+        t.Remove() # Detele the tag
 
 def MergeSelectionTags(selection):
 
@@ -112,17 +84,12 @@ def MergeSelectionTags(selection):
             collectedTags.append(s)
 
     if len(collectedTags) == 0: # If no tags selected
-        for i, obj in enumerate(collectedObjects):
-            collectedTags = []
-            tags = obj.GetTags()
-            for t in tags:
-                if type(t).__name__ == "SelectionTag":
-                    collectedTags.append(t)
-            polyTags, edgeTags, pointTags, objects = SortTags(collectedTags)
-            MergePolySelectionTags(polyTags, edgeTags, pointTags, objects)
+        index = {}
+        for obj in collectedObjects:
+            SortTags(obj.GetTags(), index)
     else: # If tags selected
-        polyTags, edgeTags, pointTags, objects = SortTags(collectedTags)
-        MergePolySelectionTags(polyTags, edgeTags, pointTags, objects)
+        index = SortTags(collectedTags)
+    MergePolySelectionTags(index)
 
 def main():
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
@@ -4,47 +4,61 @@ AR_TakeMaterialPreviews
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_TakeMaterialPreviews
-Version: 1.0.0
+Version: 1.1.0
 Description-US: Creates take for each selected material assigned to selected object
 
 Written for Maxon Cinema 4D 2024.1.0
 Python version 3.11.4
 
 Change log:
+1.1.0 (19.10.2026) - Takes are created in one pass with cached last take and shared override template. Only the material is overridden per take.
 1.0.0 (26.12.2023) - Initial realease
 """
 
 # Libraries
 import c4d
 
+# Classes
+class TakeBuilder(object):
+    def __init__(self, takeData):
+        self.takeData = takeData # Take data
+        self.mainTake = takeData.GetMainTake() # Get main take
+        self.template = self.mainTake.GetDown() # First child take, new takes are cloned from it
+        self.tail = GetLastTake(self.mainTake) # Cache the last take, so the take list is walked only once
+
+    def Add(self, name):
+        newTake = self.takeData.AddTake("", self.mainTake, self.template) # Add take
+        newTake.SetName(name) # Set name
+        if self.tail is None: # If there are no takes yet
+            self.takeData.InsertTake(newTake, self.mainTake, c4d.INSERT_UNDERLAST) # Move take
+        else:
+            self.takeData.InsertTake(newTake, self.tail, c4d.INSERT_AFTER) # Move take
+        self.tail = newTake # New take is the last one
+        doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, newTake) # Add undo for creating a take
+        return newTake
+
 # Functions
 def GetLastTake(mainTake):
+    prevTake = None
     nextTake = mainTake.GetDown()
     while nextTake:
         prevTake = nextTake
         nextTake = nextTake.GetNext()
     return prevTake
 
-def CreateTake(material, materialTag, obj):
-    doc.StartUndo() # Start recording undos
-
-    # Take stuff
-    takeData  = doc.GetTakeData() # Get take data
-    mainTake  = takeData.GetMainTake() # Get main take
-    childTake = mainTake.GetDown() # Get first child take
+def CreateTakes(materials, materialTag):
+    takeData = doc.GetTakeData() # Get take data
+    builder  = TakeBuilder(takeData) # Initialize take builder
+    startTake = takeData.GetCurrentTake() # Get current take
 
-    newTake = takeData.AddTake("", mainTake, childTake) # Add take
-    newTake.SetName(material.GetName()) # Set name
-    takeData.InsertTake(newTake, GetLastTake(mainTake), c4d.INSERT_AFTER) # Move take
-    takeData.SetCurrentTake(newTake) # Set current/active take
+    undoClone = materialTag.GetClone() # One override template shared by every take
+    for material in materials: # Iterate through materials
+        newTake = builder.Add(material.GetName()) # Add take
+        takeData.SetCurrentTake(newTake) # Set current/active take
+        materialTag[c4d.TEXTURETAG_MATERIAL] = material # Set matertial
+        newTake.AutoTake(takeData, materialTag, undoClone) # Override only the material
 
-    undoClone = materialTag.GetClone() # Get clone of material tag
-    materialTag[c4d.TEXTURETAG_MATERIAL] = material # Set matertial
-    materialTag[c4d.TEXTURETAG_PROJECTION] = 6 # UVW Mapping
-    newTake.AutoTake(takeData, materialTag, undoClone) # Modify take
-
-    doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, newTake) # Add undo for creating a take
-    doc.EndUndo() # Stop recording undos
+    takeData.SetCurrentTake(startTake) # Set current/active take back
 
 def main():
     materials = doc.GetMaterials() # Get materials
@@ -54,19 +68,19 @@ def main():
             selectedMaterials.append(m) # Add material to array
 
     obj = doc.GetActiveObject() # Get selected object
+    if obj is None or len(selectedMaterials) == 0: # If nothing to do
+        return
 
-    takeData  = doc.GetTakeData() # Get take data
-    mainTake  = takeData.GetMainTake() # Get main take
-    childTake = mainTake.GetDown() # Get first child take
+    doc.StartUndo() # Start recording undos
 
     materialTag = c4d.BaseTag(5616) # Initialize a material tag
+    materialTag[c4d.TEXTURETAG_PROJECTION] = 6 # UVW Mapping, same for every take
     obj.InsertTag(materialTag) # Insert material tag
     doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, materialTag) # Add undo step
 
-    for m in selectedMaterials: # Iterate through selected materials
-        CreateTake(m, materialTag, obj) # Create take
-        takeData.SetCurrentTake(childTake) # Set current/active take
+    CreateTakes(selectedMaterials, materialTag) # Create takes in one pass
 
+    doc.EndUndo() # Stop recording undos
     c4d.EventAdd() # Refresh Cinema 4D
 
 if __name__ == '__main__':
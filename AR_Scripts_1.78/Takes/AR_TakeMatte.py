@@ -4,8 +4,8 @@ AR_TakeMatte
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_TakeMatte
-Version: 1.0.0
-Description-US: Creates matte take from selected materials.
+Version: 1.1.0
+Description-US: Creates matte take from selected materials. Batch: Creates matte take for every selected material (or every material if nothing is selected).
 
 NOTE: Create one child take (clone of the main take) to make this script fully function correctly
 
@@ -13,6 +13,8 @@ Written for Maxon Cinema 4D 2024.1.0
 Python version 3.11.4
 
 Change log:
+1.1.0 (19.10.2026) - Batch option to create one matte take per material. Material takes are children of one black take and override only their own tags.
+1.0.1 (19.10.2026) - Material tags are indexed by material in one pass, instead of comparing every tag against every material
 1.0.0 (25.12.2023) - Initial realease
 """
 
@@ -29,10 +31,12 @@ GRP_BUTTONS  = 1002
 STR_TAKENAME = 4000
 STR_WHITE    = 4001
 STR_BLACK    = 4002
+STR_BATCH    = 4003
 
 OPT_TAKENAME = 2000
 OPT_WHITE    = 2001
 OPT_BLACK    = 2002
+OPT_BATCH    = 2003
 
 BTN_OK       = 3000
 BTN_CANCEL   = 3001
@@ -54,14 +58,14 @@ def GetNextObject(op):
     return op.GetNext()
 
 def CollectMaterialTags(op):
-    materialTags = []
-    if op is None:
-        return
+    materialTags = {} # Initialize dictionary, material: [material tags]
     while op:
         tags = op.GetTags()
         for t in tags:
             if t.GetType() == 5616: # Material tag
-                    materialTags.append(t)
+                material = t[c4d.TEXTURETAG_MATERIAL]
+                if material is not None:
+                    materialTags.setdefault(material, []).append(t)
         op = GetNextObject(op)
     return materialTags
 
@@ -77,7 +81,7 @@ def CreateTake(takeName, whiteMaterial, blackMaterial):
 
     # Collect stuff
     materials = doc.GetMaterials() # Get materials
-    materialTags = CollectMaterialTags(doc.GetFirstObject()) # Get all material tags
+    materialTags = CollectMaterialTags(doc.GetFirstObject()) # Get all material tags by material
 
     if len(materials) == 0: # If no materials
         return False
@@ -110,25 +114,80 @@ def CreateTake(takeName, whiteMaterial, blackMaterial):
     takeData.InsertTake(newTake, GetLastTake(mainTake), c4d.INSERT_AFTER)
 
     # Material tags
-    for t in materialTags: # Iterate through material tags
-
-        for s in notSelectedMaterials: # Iterate through non selected materials
-            if t[c4d.TEXTURETAG_MATERIAL] == s: # If material tag is using selected material
+    for materials, newMaterial in ((notSelectedMaterials, blackMaterial), (selectedMaterials, whiteMaterial)):
+        for m in materials: # Iterate through materials
+            for t in materialTags.get(m, []): # Iterate through material tags using the material
                 tClone = t.GetClone() # Get clone of the material tag
                 doc.AddUndo(c4d.UNDOTYPE_CHANGE, t) # Add undo for modifying tag
-                t[c4d.TEXTURETAG_MATERIAL] = blackMaterial # Set white material
-                newTake.AutoTake(takeData, t, tClone) # Modify take
-
-        for s in selectedMaterials: # Iterate through selected materials
-            if t[c4d.TEXTURETAG_MATERIAL] == s: # If material tag is using selected material
-                tClone = t.GetClone() # Get clone of the material tag
-                doc.AddUndo(c4d.UNDOTYPE_CHANGE, t) # Add undo for modifying tag
-                t[c4d.TEXTURETAG_MATERIAL] = whiteMaterial # Set white material
+                t[c4d.TEXTURETAG_MATERIAL] = newMaterial # Set white or black material
                 newTake.AutoTake(takeData, t, tClone) # Modify take
 
     doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, newTake) # Add undo for creating a take
     doc.EndUndo() # Stop recording undos
 
+def CreateBatchTakes(takeName, whiteMaterial, blackMaterial):
+    doc.StartUndo() # Start recording undos
+
+    # Collect stuff
+    materials = doc.GetMaterials() # Get materials
+    materialTags = CollectMaterialTags(doc.GetFirstObject()) # Get all material tags by material, only once
+
+    if len(materialTags) == 0: # If no material tags
+        doc.EndUndo()
+        return False
+
+    # Materials that get own take, selected materials or every material
+    targetMaterials = [m for m in materials if m.GetBit(c4d.BIT_ACTIVE)]
+    if len(targetMaterials) == 0:
+        targetMaterials = materials
+    targetMaterials = [m for m in targetMaterials if m != whiteMaterial and m != blackMaterial and m in materialTags]
+
+    if len(targetMaterials) == 0: # If nothing to do
+        doc.EndUndo()
+        return False
+
+    # Take stuff
+    takeData  = doc.GetTakeData() # Get take data
+    mainTake  = takeData.GetMainTake() # Get main take
+    childTake = mainTake.GetDown() # Get first child take
+
+    # Parent take, every material tag is black. Child takes inherit these overrides
+    baseTake = takeData.AddTake("", mainTake, childTake) # Add take
+    baseTake.SetName(takeName) # Set name
+    takeData.InsertTake(baseTake, GetLastTake(mainTake), c4d.INSERT_AFTER)
+    doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, baseTake) # Add undo for creating a take
+    takeData.SetCurrentTake(baseTake) # Set current/active take
+    for m, tags in materialTags.items(): # Iterate through materials
+        if m == blackMaterial: # Already black, no override needed
+            continue
+        for t in tags: # Iterate through material tags
+            tClone = t.GetClone() # Get clone of the material tag
+            doc.AddUndo(c4d.UNDOTYPE_CHANGE, t) # Add undo for modifying tag
+            t[c4d.TEXTURETAG_MATERIAL] = blackMaterial # Set black material
+            baseTake.AutoTake(takeData, t, tClone) # Modify take
+
+    # Take per material, only the tags of the material are overridden
+    prevTake = None
+    for m in targetMaterials: # Iterate through materials
+        newTake = takeData.AddTake(takeName + "_" + m.GetName(), baseTake, None) # Add take
+        if prevTake is None:
+            takeData.InsertTake(newTake, baseTake, c4d.INSERT_UNDERLAST)
+        else:
+            takeData.InsertTake(newTake, prevTake, c4d.INSERT_AFTER)
+        doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, newTake) # Add undo for creating a take
+        takeData.SetCurrentTake(newTake) # Set current/active take
+        for t in materialTags[m]: # Iterate through material tags using the material
+            tClone = t.GetClone() # Get clone of the material tag
+            doc.AddUndo(c4d.UNDOTYPE_CHANGE, t) # Add undo for modifying tag
+            t[c4d.TEXTURETAG_MATERIAL] = whiteMaterial # Set white material
+            newTake.AutoTake(takeData, t, tClone) # Modify take
+        prevTake = newTake
+
+    takeData.SetCurrentTake(baseTake) # Set current/active take
+    doc.EndUndo() # Stop recording undos
+    c4d.StatusSetText("Created %s matte take(s)" % len(targetMaterials)) # Report
+    return True
+
 # Classes
 class Dialog(GeDialog):
     def __init__(self):
@@ -155,6 +214,9 @@ class Dialog(GeDialog):
         self.AddStaticText(STR_BLACK, c4d.BFH_LEFT, name = "Black Material")
         self.AddEditText(OPT_BLACK, c4d.BFH_LEFT, 150, 10)
 
+        self.AddStaticText(STR_BATCH, c4d.BFH_LEFT, name = "Batch")
+        self.AddCheckbox(OPT_BATCH, c4d.BFH_LEFT, 150, 13, "Take per material")
+
         self.GroupEnd() # End 'Anchor' group
         # ----------------------------------------------------------------------------------------
         self.GroupBegin(GRP_BUTTONS, c4d.BFH_CENTER, 0, 0, "Buttons") # Begin 'Buttons' group
@@ -196,7 +258,10 @@ class Dialog(GeDialog):
             if blackMaterial == None:
                 return False
 
-            CreateTake(takeName, whiteMaterial, blackMaterial)
+            if self.GetBool(OPT_BATCH): # If take per material
+                CreateBatchTakes(takeName, whiteMaterial, blackMaterial)
+            else:
+                CreateTake(takeName, whiteMaterial, blackMaterial)
 
             c4d.EventAdd() # Refresh Cinema 4D
 
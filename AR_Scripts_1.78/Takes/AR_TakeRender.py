@@ -0,0 +1,261 @@
+"""
+AR_TakeRender
+
+Author: Arttu Rautio (aturtur)
+Website: http://aturtur.com/
+Name-US: AR_TakeRender
+Version: 1.0.0
+Description-US: Renders marked take(s) in parallel. Default: Command line renderer processes. Shift: Set concurrency. Ctrl: Render current frame of takes inside Cinema 4D one after another
+
+NOTE: Project has to be saved when using command line renderer!
+
+Written for Maxon Cinema 4D 2024.4.0
+Python version 3.11.4
+
+Change log:
+1.0.0 (19.10.2026) - Initial realease
+"""
+
+# Libraries
+import c4d
+import os
+import sys
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from c4d import storage
+from c4d import gui
+
+# Global variables
+imageExtensions = {"FILTER_TIF": ".tif", "FILTER_TGA": ".tga", "FILTER_BMP": ".bmp", "FILTER_IFF": ".iff",
+                   "FILTER_JPG": ".jpg", "FILTER_PICT": ".pct", "FILTER_PSD": ".psd", "FILTER_PSB": ".psb",
+                   "FILTER_RLA": ".rla", "FILTER_RPF": ".rpf", "FILTER_PNG": ".png", "FILTER_HDR": ".hdr",
+                   "FILTER_EXR": ".exr", "FILTER_DPX": ".dpx", "FILTER_B3D": ".b3d"} # Save format constant: file extension
+
+# Functions
+def CheckFiles():
+    folder = storage.GeGetC4DPath(c4d.C4D_PATH_PREFS) # Get C4D's preference folder path
+    folder = os.path.join(folder, "aturtur") # Aturtur folder
+    if not os.path.exists(folder): # If folder doesn't exist
+        os.makedirs(folder) # Create folder
+    fileName = "AR_TakeRender.txt" # File name
+    filePath = os.path.join(folder, fileName) # File path
+    if not os.path.isfile(filePath): # If file doesn't exist
+        f = open(filePath,"w+")
+        f.write("2") # Default settings
+        f.close()
+    return filePath
+
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
+def LoadConcurrency():
+    optionsFile = CheckFiles() # Get options file
+    f = open(optionsFile) # Open the file for reading
+    try:
+        value = max(1, int(f.readline())) # Get value from the file
+    except ValueError:
+        value = 2
+    f.close() # Close file
+    return value
+
+def SaveConcurrency(value):
+    optionsFile = CheckFiles() # Get options file
+    f = open(optionsFile, 'w') # Open the file for writing
+    f.write(str(value)) # Write current value to file
+    f.close() # Close file
+
+def GetNextObject(op):
+    if op==None:
+        return None
+    if op.GetDown():
+        return op.GetDown()
+    while not op.GetNext() and op.GetUp():
+        op = op.GetUp()
+    return op.GetNext()
+
+def CollectMarkedTakes(op):
+    takes = []
+    while op:
+        if op[c4d.TAKEBASE_CHECK] == True: # If take is marked
+            takes.append(op)
+        op = GetNextObject(op)
+    return takes
+
+def GetCommandline():
+    app = storage.GeGetStartupApplication() # Get Cinema 4D executable path
+    folder = os.path.dirname(app)
+    if sys.platform == "darwin": # MacOS, the path points inside the app bundle
+        while folder.endswith(".app") or ".app" in folder:
+            folder = os.path.dirname(folder)
+        return os.path.join(folder, "Commandline.app", "Contents", "MacOS", "Commandline")
+    return os.path.join(folder, "Commandline.exe")
+
+def RenderCommandline(commandline, docPath, takeName, threads):
+    args = [commandline, "-nogui", "-render", docPath, "-take", takeName]
+    if threads > 0:
+        args.extend(["-threads", str(threads)])
+    result = subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
+
+def GetOutputPath(takeDoc, take, renderData):
+    path = renderData[c4d.RDATA_PATH] # Get output path
+    if path == "": # No output path
+        return None
+    rpd = {'_doc': takeDoc, '_rData': renderData, '_rBc': renderData.GetData(), '_take': take}
+    path = c4d.modules.tokensystem.FilenameConvertTokens(path, rpd) # Resolve tokens
+    if not os.path.isabs(path): # Relative to the project
+        path = os.path.join(takeDoc.GetDocumentPath(), path)
+    return path
+
+def GetExtension(saveFormat):
+    for name, extension in imageExtensions.items():
+        if getattr(c4d, name, None) == saveFormat:
+            return extension
+    return ""
+
+def RenderInternal(takeDoc, take):
+    renderData = takeDoc.GetActiveRenderData() # Take's effective render data
+    path = GetOutputPath(takeDoc, take, renderData)
+    if path is None:
+        return False
+    settings = renderData.GetDataInstance().GetClone(c4d.COPYFLAGS_NONE) # Render settings
+    settings[c4d.RDATA_FRAMESEQUENCE] = c4d.RDATA_FRAMESEQUENCE_CURRENTFRAME # Stills only
+    width = int(settings[c4d.RDATA_XRES])
+    height = int(settings[c4d.RDATA_YRES])
+    bmp = c4d.bitmaps.MultipassBitmap(width, height, c4d.COLORMODE_RGB)
+    bmp.AddChannel(True, True) # Alpha channel
+    result = c4d.documents.RenderDocument(takeDoc, settings, bmp, c4d.RENDERFLAGS_EXTERNAL | c4d.RENDERFLAGS_NODOCUMENTCLONE)
+    if result != c4d.RENDERRESULT_OK:
+        return False
+    extension = GetExtension(settings[c4d.RDATA_FORMAT]) # Output path is without extension
+    if os.path.splitext(path)[1].lower() != extension:
+        path += extension
+    folder = os.path.dirname(path)
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    return bmp.Save(path, settings[c4d.RDATA_FORMAT], c4d.BaseContainer(), c4d.SAVEBIT_ALPHA) == c4d.IMAGERESULT_OK
+
+def ShowProgress(done, total, start):
+    elapsed = max(time.time() - start, 0.001)
+    c4d.StatusSetBar(int(100.0 * done / total))
+    c4d.StatusSetText("Rendered %s of %s takes (%.2f takes/min)" % (done, total, done / elapsed * 60.0))
+
+def Dispatch(jobs, concurrency, threaded=True):
+    done = 0 # Finished jobs
+    failed = [] # Failed take names
+    start = time.time()
+    if not threaded: # Cinema 4D's API is used only from the main thread, one take after another
+        for name, prepare in jobs:
+            job = prepare() # Function and arguments
+            try:
+                ok = job is not None and job[0](*job[1])
+            except Exception:
+                ok = False
+            done += 1
+            if not ok:
+                failed.append(name)
+            ShowProgress(done, len(jobs), start)
+    else:
+        waiting = list(reversed(jobs)) # Jobs not started yet (name, prepare function)
+        running = {} # Future: take name
+        with ThreadPoolExecutor(max_workers=concurrency) as pool: # Worker pool, waits for the renderer processes
+            while waiting or running:
+                while waiting and len(running) < concurrency: # Prepare jobs only when there is a free worker
+                    name, prepare = waiting.pop()
+                    job = prepare() # Function and arguments, prepared on the main thread
+                    if job is None:
+                        done += 1
+                        failed.append(name)
+                        continue
+                    running[pool.submit(job[0], *job[1])] = name
+                finished = wait(running, return_when=FIRST_COMPLETED)[0] # Collect results when ready
+                for future in finished:
+                    name = running.pop(future)
+                    done += 1
+                    try:
+                        ok = future.result()
+                    except Exception:
+                        ok = False
+                    if not ok:
+                        failed.append(name)
+                ShowProgress(done, len(jobs), start)
+    elapsed = time.time() - start
+    c4d.StatusClear()
+    print("AR_TakeRender: %s take(s) rendered in %.1f s, %.2f takes/min, concurrency %s" % (len(jobs) - len(failed), elapsed, len(jobs) / max(elapsed, 0.001) * 60.0, concurrency if threaded else 1))
+    for name in failed:
+        print("AR_TakeRender: Failed to render take '%s'" % name)
+
+def PrepareInternal(doc, takeData, take):
+    takeDoc = takeData.TakeToDocument(take) # Clone document with take's overrides applied
+    if takeDoc is None:
+        return None
+    takeDoc.SetDocumentPath(doc.GetDocumentPath()) # Keep relative paths working
+    takeDoc.SetDocumentName(doc.GetDocumentName())
+    return RenderInternal, (takeDoc, take)
+
+def main():
+    keyMod = GetKeyMod() # Get keymodifier
+    concurrency = LoadConcurrency() # Get concurrency limit
+    if keyMod == "Shift":
+        inp = gui.InputDialog('Concurrent renders', str(concurrency)) # Store user given value
+        if inp in (None, ""): return
+        try:
+            concurrency = max(1, int(inp))
+        except ValueError: # Not a number
+            gui.MessageDialog("Give a whole number!")
+            return
+        SaveConcurrency(concurrency)
+
+    takeData = doc.GetTakeData() # Get take data
+    takes = CollectMarkedTakes(takeData.GetMainTake()) # Collect marked takes
+    if len(takes) == 0: # If no marked takes
+        gui.MessageDialog("No marked takes!")
+        return
+
+    jobs = [] # Initialize a list for render jobs (name, prepare function)
+    if keyMod == "Ctrl": # Render inside Cinema 4D, every take in own document, one after another
+        for take in takes: # Documents are cloned only when the take is started
+            jobs.append((take.GetName(), lambda take=take: PrepareInternal(doc, takeData, take)))
+    else: # Command line renderer processes, renderer applies the take to its own copy of the project
+        docPath = os.path.join(doc.GetDocumentPath(), doc.GetDocumentName())
+        if doc.GetDocumentPath() == "" or doc.GetChanged():
+            gui.MessageDialog("Save the project first!")
+            return
+        commandline = GetCommandline()
+        if not os.path.isfile(commandline):
+            gui.MessageDialog("Command line renderer not found!\n" + commandline)
+            return
+        threads = max(1, c4d.threading.GeGetCurrentThreadCount() // concurrency) # Share cores between processes
+        for take in takes:
+            jobs.append((take.GetName(), lambda take=take: (RenderCommandline, (commandline, docPath, take.GetName(), threads))))
+
+    Dispatch(jobs, concurrency, threaded=keyMod != "Ctrl") # Render
+    c4d.EventAdd() # Refresh Cinema 4D
+
+# Execute main()
+if __name__=='__main__':
+    main()
@@ -4,23 +4,164 @@ AR_PrintType
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_PrintType
-Version: 1.0
-Description-US: Prints info about selected objects, tags, materials, Xpresso nodes and Redshift nodes.
+Version: 1.1.0
+Description-US: Prints info about selected objects, tags, materials, Xpresso nodes and Redshift nodes. Shift: Prints graph report of all node graphs as JSON. Ctrl: Saves graph report as CSV.
 
 Written for Maxon Cinema 4D R21.207
 Python version 2.7.14
+
+Change log:
+1.1.0 (19.10.2026) - Shift: Graph report (nodes, connections, longest path, unused nodes, duplicate textures) of every Xpresso tag and Redshift material as JSON
+                     Ctrl: Saves the same report as CSV file
 """
 # Libraries
 import c4d
+import csv
+import json
+from collections import deque
 try:
     import redshift
 except:
     pass
 
-# Functions 
-def main():
-    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
+# Variables
+REPORT_FIELDS = ['graph', 'type', 'nodes', 'connections', 'depth', 'unused', 'duplicateTextures']
+
+# Functions
+def GetKeyMod():
+    bc = c4d.BaseContainer() # Initialize a base container
+    keyMod = "None" # Initialize a keyboard modifier status
+    # Button is pressed
+    if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD,c4d.BFM_INPUT_CHANNEL,bc):
+        if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL: # Ctrl + Shift
+                if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl + Shift
+                    keyMod = 'Alt+Ctrl+Shift'
+                else: # Shift + Ctrl
+                    keyMod = 'Ctrl+Shift'
+            elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Shift
+                keyMod = 'Alt+Shift'
+            else: # Shift
+                keyMod = 'Shift'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QCTRL:
+            if bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt + Ctrl
+                keyMod = 'Alt+Ctrl'
+            else: # Ctrl
+                keyMod = 'Ctrl'
+        elif bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QALT: # Alt
+            keyMod = 'Alt'
+        else: # No keyboard modifiers used
+            keyMod = 'None'
+        return keyMod
+
+def GetNextObject(op):
+    if op == None:
+        return None
+    if op.GetDown():
+        return op.GetDown()
+    while not op.GetNext() and op.GetUp():
+        op = op.GetUp()
+    return op.GetNext()
+
+def CollectNodeMasters(doc):
+    graphs = [] # Initialize a list for (name, type, node master)
+    op = doc.GetFirstObject()
+    while op: # Iterate through objects
+        for t in op.GetTags(): # Iterate through tags
+            if t.GetType() == c4d.Texpresso: # If xpresso tag
+                graphs.append((op.GetName()+" / "+t.GetName(), "Xpresso", t.GetNodeMaster()))
+        op = GetNextObject(op)
+    for m in doc.GetMaterials(): # Iterate through materials
+        if m.GetType() == 1036224: # If Redshift material
+            try:
+                graphs.append((m.GetName(), "Redshift", redshift.GetRSMaterialNodeMaster(m)))
+            except:
+                pass
+    return graphs
+
+def CollectNodes(node, nodes):
+    while node: # Iterate through nodes, including nodes inside groups
+        nodes.append(node)
+        CollectNodes(node.GetDown(), nodes)
+        node = node.GetNext()
+    return nodes
+
+def GraphStats(nodeMaster):
+    nodes = CollectNodes(nodeMaster.GetRoot().GetDown(), []) # Every node in the graph
+    index = {} # Node: index
+    for i, node in enumerate(nodes):
+        index[node] = i
+    succ = [[] for n in nodes] # Connected downstream nodes
+    pred = [[] for n in nodes] # Connected upstream nodes
+    edges = 0
+    textures = {} # Texture path: count
+    outputs = [] # Indices of Redshift output nodes
+    for i, node in enumerate(nodes): # Read the graph only once
+        for outPort in node.GetOutPorts(): # Iterate through out ports
+            for destPort in outPort.GetDestination(): # Iterate through connections
+                j = index.get(destPort.GetNode())
+                if j is None:
+                    continue
+                succ[i].append(j)
+                pred[j].append(i)
+                edges += 1
+        if node.GetOperatorID() == 1036746: # Redshift output node
+            outputs.append(i)
+        elif node.GetOperatorID() == 1036227 and node[c4d.GV_REDSHIFT_SHADER_META_CLASSNAME] == "TextureSampler":
+            path = node[c4d.REDSHIFT_SHADER_TEXTURESAMPLER_TEX0, c4d.REDSHIFT_FILE_PATH] # Get file path
+            if path:
+                textures[path] = textures.get(path, 0) + 1
+
+    # Longest path, topological order (Kahn)
+    depth = [0] * len(nodes)
+    inDegree = [len(p) for p in pred]
+    queue = deque(i for i in range(len(nodes)) if inDegree[i] == 0)
+    while queue:
+        i = queue.popleft()
+        for j in succ[i]:
+            depth[j] = max(depth[j], depth[i] + 1)
+            inDegree[j] -= 1
+            if inDegree[j] == 0:
+                queue.append(j)
 
+    # Unused nodes
+    if outputs: # Nodes that don't feed the output node
+        used = set(outputs)
+        queue = deque(outputs)
+        while queue:
+            for j in pred[queue.popleft()]:
+                if j not in used:
+                    used.add(j)
+                    queue.append(j)
+        unused = len(nodes) - len(used)
+    else: # Nodes without any connections
+        unused = sum(1 for i in range(len(nodes)) if not succ[i] and not pred[i])
+
+    return {'nodes': len(nodes),
+            'connections': edges,
+            'depth': max(depth) if depth else 0,
+            'unused': unused,
+            'duplicateTextures': sum(c - 1 for c in textures.values())}
+
+def GraphReport(doc):
+    report = [] # Initialize a list for report rows
+    for name, graphType, nodeMaster in CollectNodeMasters(doc): # Walk every graph once
+        if nodeMaster is None:
+            continue
+        row = {'graph': name, 'type': graphType}
+        row.update(GraphStats(nodeMaster))
+        report.append(row)
+    report.sort(key=lambda r: (r['nodes'], r['connections']), reverse=True) # Heaviest graphs first
+    return report
+
+def SaveReportCSV(report, fn):
+    f = open(fn, 'w', newline='') # Open the file for writing
+    writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    writer.writerows(report)
+    f.close() # Close the file
+
+def PrintInfo(doc):
     selection = doc.GetSelection() # Get active selection (objects, tags)
     for s in selection: # Iterate through selection
         
@@ -58,8 +199,21 @@ def main():
                         for p in range(0, len(outPorts)): # Loop through output ports
                             print ("    Out port: "+outPorts[p].GetName(c)+", "+str(outPorts[p].GetMainID()))# Print outPort info
 
+def main():
+    doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
+    keyMod = GetKeyMod() # Get keymodifier
+
+    if keyMod == "Shift": # Print graph report as JSON
+        print(json.dumps(GraphReport(doc), indent=4))
+    elif keyMod == "Ctrl": # Save graph report as CSV
+        fn = c4d.storage.SaveDialog(c4d.FILESELECTTYPE_ANYTHING, "Save graph report", "csv") # Select path to save
+        if fn:
+            SaveReportCSV(GraphReport(doc), fn)
+    else: # Print info about selected things
+        PrintInfo(doc)
+
     c4d.EventAdd() # Refresh Cinema 4D
-  
+
 # Execute main()
 if __name__=='__main__':
     main()
\ No newline at end of file
@@ -4,7 +4,7 @@ AR_TglEnable
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 Name-US: AR_TglEnable
-Version: 1.0.10
+Version: 1.1.0
 Description-US: Enables or disables generator. Shift: Toggle next parent generator. Ctrl: Toggle root generator. Alt: Toggle generator family
 
 Written for Maxon Cinema 4D 2024.4.0
@@ -22,6 +22,9 @@ CTRL+SHIFT: Toggle from custom list.
 ALT+CTRL+SHIFT: Open textfile to modify custom. You can use hashtag '#' separating comments. Put each generator to own line!
 
 Change log:
+1.1.0 (19.10.2026)  - Target generators are collected and deduplicated first and then changed in one pass with one undo step.
+                      Selected objects that share the same parent generator don't toggle it multiple times anymore.
+                      Reports how many unique generators changed in the status bar.
 1.0.10 (10.04.2024) - Added support for 2024.4.0 particle objects
 1.0.9 (26.02.2024)  - Added support for Thicken generator and Doodle object
 1.0.8 (15.11.2023)  - Added support for Projection deformer
@@ -80,26 +83,38 @@ def CheckFiles():
         f.close()
     return filePath
 
-def ToggleEnable(op):
-    status = op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]
-    doc.AddUndo(c4d.UNDOTYPE_CHANGE_NOCHILDREN, op)
-    op[c4d.ID_BASEOBJECT_GENERATOR_FLAG] = not op[c4d.ID_BASEOBJECT_GENERATOR_FLAG] # Toggle generator
-    if status is not op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]: return True
-    else: return False
-
-def Enable(op):
-    status = op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]
-    doc.AddUndo(c4d.UNDOTYPE_CHANGE_NOCHILDREN, op)
-    op[c4d.ID_BASEOBJECT_GENERATOR_FLAG] = True
-    if status is not op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]: return True
-    else: return False
-
-def Disable(op):
-    status = op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]
-    doc.AddUndo(c4d.UNDOTYPE_CHANGE_NOCHILDREN, op)
-    op[c4d.ID_BASEOBJECT_GENERATOR_FLAG] = False
-    if status is not op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]: return True
-    else: return False
+def ReadCustomGenerators():
+    filePath = CheckFiles() # Check required files and folders
+    customGenerators = set() # Initialize set for custom generators
+    if (sys.version_info >= (3, 0)): # If Python 3 version (R23)
+        f = open(filePath)
+    else: # If Python 2 version (R21)
+        f = open(filePath.decode("utf-8"))
+    for line in f: # Iterate through every row
+        line = line.split("#")[0].strip() # Split by hashtag (comment)
+        if line != "":
+            customGenerators.add(int(line)) # Add generator to the set
+    f.close()
+    return customGenerators
+
+def AddTarget(targets, op, state):
+    guid = op.GetGUID() # Many selected objects can resolve to the same generator
+    if guid not in targets: # Collect every generator only once
+        targets[guid] = (op, state)
+
+def ApplyTargets(doc, targets):
+    changed = 0 # Initialize counter for changed generators
+    for op, state in targets.values(): # Iterate through unique generators
+        status = op[c4d.ID_BASEOBJECT_GENERATOR_FLAG]
+        if state is None: # Toggle
+            newStatus = not status
+        else: # Force enable or disable
+            newStatus = state
+        if bool(status) == newStatus: continue # Nothing to change
+        doc.AddUndo(c4d.UNDOTYPE_CHANGE_NOCHILDREN, op)
+        op[c4d.ID_BASEOBJECT_GENERATOR_FLAG] = newStatus
+        changed += 1
+    return changed
 
 def GetRoot(obj):
     while obj: # Infinite loop
@@ -478,14 +493,23 @@ def main():
                 1059475  # nxConstraints
     ]
 
-    default = generators + mggenerators
-    allGenerators = deformers + objects + splines + generators + mggenerators + mgeffectors + fields + particles + newparticles + connectors + others + scenenodes + redshift + insydium + thirdparty
+    default = set(generators + mggenerators)
+    allGenerators = set(deformers + objects + splines + generators + mggenerators + mgeffectors + fields + particles + newparticles + connectors + others + scenenodes + redshift + insydium + thirdparty)
 
     doc = c4d.documents.GetActiveDocument() # Get active Cinema 4D document
-    doc.StartUndo() # Start recording undos
     keyMod = GetKeyMod() # Get keymodifier
-    #try:
-    # Get selected objects and iterate through those
+
+    # 8. Open textfile to modify custom
+    if keyMod == "Alt+Ctrl+Shift":
+        filePath = CheckFiles() # Check required files and folders
+        storage.GeExecuteFile(filePath) # Open data file for editing custom generators
+        return
+
+    if keyMod == "Ctrl+Shift":
+        customGenerators = ReadCustomGenerators() # Read custom list only once
+
+    # Collect unique target generators first
+    targets = {} # Initialize dictionary for target generators (GUID: (object, state))
     selection = doc.GetActiveObjects(1) # Get selection
     for s in selection: # Iterate through selected objects
         x = s
@@ -493,16 +517,16 @@ def main():
         if keyMod == "None":
             if len(selection) == 1:
                 if x.GetType() in allGenerators:
-                    ToggleEnable(x)
+                    AddTarget(targets, x, None)
                 else:
                     while(True):
                         x = x.GetUp()
                         if x is None: break
                         if x.GetType() in default:
-                            success = ToggleEnable(x)
-                            if success: break
+                            AddTarget(targets, x, None)
+                            break
             else:
-                ToggleEnable(x)
+                AddTarget(targets, x, None)
 
         # 2. Enable/disable next parent generator from common list (SHIFT)
         elif keyMod == "Shift":
@@ -510,8 +534,8 @@ def main():
                 x = x.GetUp()
                 if x is None: break
                 if x.GetType() in default:
-                    success = ToggleEnable(x)
-                    if success: break
+                    AddTarget(targets, x, None)
+                    break
 
         # 3. Enable/disable root parent generator from common list (CTRL)
         elif keyMod == "Ctrl":
@@ -522,55 +546,41 @@ def main():
                     lastGen = x
                 x = x.GetUp()
             if lastGen != None:
-                ToggleEnable(lastGen)
+                AddTarget(targets, lastGen, None)
 
         # 4. Enable/disable all parent generators from common list (ALT)
         elif keyMod == "Alt": # Enable/disable next parent generator from common list
             while(True):
                 if x is None: break
                 if x.GetType() in default:
-                    success = ToggleEnable(x)
+                    AddTarget(targets, x, None)
                 x = x.GetUp()
 
         # 5. Force disable (ALT + CTRL)
         elif keyMod == "Alt+Ctrl":
-            Disable(x)
+            AddTarget(targets, x, False)
 
         # 6. Force enable (ALT + SHIFT)
         elif keyMod == "Alt+Shift":
-            Enable(x)
+            AddTarget(targets, x, True)
 
         # 7. Toggle custom
         elif keyMod == "Ctrl+Shift":
-            filePath = CheckFiles() # Check required files and folders
-            customGenerators = [] # Initialize list for custom generators
-            if (sys.version_info >= (3, 0)): # If Python 3 version (R23)
-                f = open(filePath)
-            else: # If Python 2 version (R21)
-                f = open(filePath.decode("utf-8"))
-            for line in f: # Iterate through every row
-                line = line.split("#") # Split by hashtag (comment)
-                customGenerators.append(int(line[0])) # Add generator to the list
             if x.GetType() in customGenerators:
-                ToggleEnable(x)
+                AddTarget(targets, x, None)
             else:
                 while(True):
                     x = x.GetUp()
                     if x is None: break
                     if x.GetType() in customGenerators:
-                        success = ToggleEnable(x)
-                        if success: break
-
-    # 8. Open textfile to modify custom
-    if keyMod == "Alt+Ctrl+Shift":
-        filePath = CheckFiles() # Check required files and folders
-        storage.GeExecuteFile(filePath) # Open data file for editing custom generators
-        pass
-
-    #except:
-        #pass
+                        AddTarget(targets, x, None)
+                        break
 
+    # Flip generators in one pass
+    doc.StartUndo() # Start recording undos
+    changed = ApplyTargets(doc, targets)
     doc.EndUndo() # Stop recording undos
+    c4d.StatusSetText("%s unique generator(s) changed" % changed) # Report
     c4d.EventAdd() # Refresh Cinema 4D
 
 # Execute main()
@@ -4,7 +4,7 @@ AR_Modules
 Author: Arttu Rautio (aturtur)
 Website: http://aturtur.com/
 
-Version: 1.4.0
+Version: 1.5.1
 
 Installation path: C:/Users/[USER]]/AppData/Roaming/MAXON/Maxon Cinema 4D [VERSION]/python311/libs
 
@@ -13,6 +13,8 @@ Python version 3.11.4
 
 Change log:
 
+1.5.1 (19.10.2026) - ImportAsset reports a missing asset file instead of raising an error
+1.5.0 (19.10.2026) - ImportAsset keeps loaded asset documents in memory (least recently used are released) and uses render instances for multiple targets
 1.4.0 (17.12.2023) - Merged with ar_template
 1.3.0 (25.09.2022) - Alt+Ctrl+Shift keymodifier opens the asset document
 1.2.1 (16.09.2022) - Bug fixes and code improvements
@@ -43,8 +45,9 @@ Main functions and their arguments:
 """
 
 # Libraries
-import random
+import os
 import c4d
+from collections import OrderedDict
 from c4d import documents
 from c4d import storage
 
@@ -128,6 +131,9 @@ fields = [1040449, # Group Field
           1040448, # Radial Field
           440000266] # Linear Field
 
+templateLimit = 8 # Asset documents kept in memory
+templates = OrderedDict() # (path, mtime): asset document, least recently used first
+
 # Functions
 def GetKeyMod():
     bc = c4d.BaseContainer() # Initialize a base container
@@ -256,6 +262,32 @@ def GetIconPath(scriptPath):
         return ""
     return iconPath
 
+def LoadTemplate(path):
+    global templates
+    try:
+        key = (path, os.path.getmtime(path)) # Changed asset file gets a new key
+    except OSError: # Asset file is missing or moved
+        return None
+    tempDoc = templates.pop(key, None)
+    if tempDoc is None:
+        for old in [k for k in templates if k[0] == path]: # Release outdated versions of the asset
+            documents.KillDocument(templates.pop(old))
+        tempDoc = documents.BaseDocument() # Create temp doc
+        flags = c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS | c4d.SCENEFILTER_MERGESCENE # Merge objects and materials
+        if not c4d.documents.MergeDocument(tempDoc, path, flags): # Merge asset to temp doc
+            documents.KillDocument(tempDoc)
+            return None
+        while len(templates) >= templateLimit: # Release the least recently used asset
+            documents.KillDocument(templates.popitem(last=False)[1])
+    templates[key] = tempDoc # Most recently used
+    return tempDoc
+
+def CreateInstance(asset):
+    instance = c4d.BaseObject(c4d.Oinstance) # Initialize an instance object
+    instance[c4d.INSTANCEOBJECT_LINK] = asset # Set reference object
+    instance[c4d.INSTANCEOBJECT_RENDERINSTANCE_MODE] = c4d.INSTANCEOBJECT_RENDERINSTANCE_MODE_RENDERINSTANCE # Render instance
+    return instance
+
 def ImportAsset(path=None, icon=None, color=None, matsOnly=False):
 
     # Check path
@@ -264,7 +296,6 @@ def ImportAsset(path=None, icon=None, color=None, matsOnly=False):
         return False
 
     doc = documents.GetActiveDocument() # Get active document
-    doc.StartUndo() # Start recording undos
     keyMod = GetKeyMod() # Get keymodifier
     selection = doc.GetActiveObjects(c4d.GETACTIVEOBJECTFLAGS_NONE) # Get active objects
 
@@ -272,15 +303,21 @@ def ImportAsset(path=None, icon=None, color=None, matsOnly=False):
         storage.GeExecuteFile(path) # Open the asset
     else:
         # Import the asset
-        tempDoc = documents.BaseDocument() # Create temp doc
-        flags = c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS | c4d.SCENEFILTER_MERGESCENE # Merge objects and materials
-        c4d.documents.MergeDocument(tempDoc, path, flags) # Merge asset to active project
-        asset = tempDoc.GetFirstObject() # Get the imported asset
-        #texTags, materials = GetAssetsMaterials(asset) # Get all materials
-        materials = tempDoc.GetMaterials() # Get all materials
-
+        tempDoc = LoadTemplate(path) # Cached asset document
+        if tempDoc == None:
+            print("Could not load the asset!")
+            return False
+        trans = c4d.AliasTrans() # Keeps links between cloned objects and materials
+        trans.Init(tempDoc)
+        asset = tempDoc.GetFirstObject() # Get the asset
+        if asset != None and not matsOnly:
+            asset = asset.GetClone(c4d.COPYFLAGS_NONE, trans) # Clone the asset, template stays untouched
+        materials = [m.GetClone(c4d.COPYFLAGS_NONE, trans) for m in tempDoc.GetMaterials()] # Clone all materials
+        trans.Translate(True) # Link clones to cloned materials
+
+        doc.StartUndo() # Start recording undos
         # Set the icon and the color for the asset
-        if asset != None:
+        if asset != None and not matsOnly:
             if icon != None:
                 icon = GetIconPath(icon) # Get icon path
                 asset[c4d.ID_BASELIST_ICON_FILE] = icon # Set icon path
@@ -290,55 +327,47 @@ def ImportAsset(path=None, icon=None, color=None, matsOnly=False):
         for m in materials: # Iterate through collected materials
             doc.InsertMaterial(m, checknames=True)
             doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, m)
-        if not matsOnly:
-            doc.InsertObject(asset, checknames=True)
-            assetName = asset.GetName() # Get asset's original name
-            asset.SetName(random.randint(100000,999999))
-            if len(selection) != 0:
-                if keyMod != "None":
-                    for s in selection: # Iterate through selected objects
-                        clone = asset.GetClone()
-                        clone.SetName(assetName)
-                        if keyMod == "Shift": # Insert to child
-                            doc.AddUndo(c4d.UNDOTYPE_BITS, s)
-                            if s.GetNBit(c4d.NBIT_OM1_FOLD) == False:
-                                    s.ChangeNBit(c4d.NBIT_OM1_FOLD, c4d.NBITCONTROL_TOGGLE)
-                            doc.InsertObject(clone, parent=s, checknames=True)
-                        elif keyMod == "Alt": # Insert to parent
-                            doc.AddUndo(c4d.UNDOTYPE_CHANGE, s)
-                            mat = s.GetMg()
-                            parent = CheckParent(s)
-                            pred = CheckPred(s)
-                            doc.InsertObject(clone, parent=parent, pred=pred, checknames=True)
-                            clone.SetMg(mat)
-                            s.InsertUnder(clone)
-                            s.SetMg(mat)
-                        elif keyMod == "Ctrl": # Insert next
-                            doc.InsertObject(clone, pred=s, checknames=True)
-                            clone.SetMg(s.GetMg())
+        if not matsOnly and asset != None:
+            if len(selection) != 0 and keyMod in ["Shift", "Alt", "Ctrl"]:
+                # Render instances of the first clone, unless asset has to be a real object or gets children
+                instance = keyMod != "Alt" and asset.GetType() not in effectors + fields + deformers + forces
+                clones = [asset] # Create all clones before inserting anything
+                for i in range(1, len(selection)):
+                    clones.append(CreateInstance(asset) if instance else asset.GetClone())
+                for s, clone in zip(selection, clones): # Iterate through selected objects
+                    clone.SetName(asset.GetName())
+                    if keyMod == "Shift": # Insert to child
+                        doc.AddUndo(c4d.UNDOTYPE_BITS, s)
+                        if s.GetNBit(c4d.NBIT_OM1_FOLD) == False:
+                                s.ChangeNBit(c4d.NBIT_OM1_FOLD, c4d.NBITCONTROL_TOGGLE)
+                        doc.InsertObject(clone, parent=s, checknames=True)
+                        doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, clone)
+                    elif keyMod == "Alt": # Insert to parent
+                        mat = s.GetMg()
+                        parent = CheckParent(s)
+                        pred = CheckPred(s)
+                        doc.InsertObject(clone, parent=parent, pred=pred, checknames=True)
                         doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, clone)
-                        AddToList(clone, s) # Try to add asset to generator
-                    asset.Remove() # Delete original
-                else:
-                    clone = asset.GetClone()
-                    clone.SetName(assetName)
-                    doc.InsertObject(clone, checknames=True)
-                    doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, clone)
-                    for s in selection: # Iterate through selected objects
-                        AddToList(clone, s) # Try to add asset to generator
+                        clone.SetMg(mat)
+                        doc.AddUndo(c4d.UNDOTYPE_CHANGE, s)
+                        s.InsertUnder(clone)
+                        s.SetMg(mat)
+                    elif keyMod == "Ctrl": # Insert next
+                        doc.InsertObject(clone, pred=s, checknames=True)
+                        doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, clone)
+                        clone.SetMg(s.GetMg())
+                    AddToList(clone, s) # Try to add asset to generator
             else:
-                clone = asset.GetClone()
-                clone.SetName(assetName)
-                doc.InsertObject(clone, checknames=True)
-                doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, asset)            
+                doc.InsertObject(asset, checknames=True)
+                doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, asset)
+                for s in selection: # Iterate through selected objects
+                    AddToList(asset, s) # Try to add asset to generator
             for s in selection:
-                s.DelBit(c4d.BIT_ACTIVE)
                 doc.AddUndo(c4d.UNDOTYPE_BITS, s)
-            asset.Remove() # Delete asset    
-        documents.KillDocument(tempDoc) # Kill the temp document
+                s.DelBit(c4d.BIT_ACTIVE)
+        doc.EndUndo() # Stop recording undos
 
     c4d.EventAdd() # Refresh Cinema 4D
-    doc.EndUndo() # Stop recording undos
 
     return True # All good
 